@@ -1,19 +1,17 @@
 # app2.py
-import io
-import base64
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 from pydantic import ValidationError
-from src.parsing.parser import extract_text_from_resume
-from src.llm.reviewer import get_resume_feedback
+from src.parsing.document import parse_resume
+from src.llm.reviewer import stream_resume_feedback
+from src.llm.client import get_client
+from src.llm.router import router
+from src.llm.structured import parse_metrics
+from src.llm.orchestrator import TASK_COMPARISON, TASK_IMPROVED_RESUME, start_review_tasks
+from src.helpers.jobs import STATUS_DONE, STATUS_FAILED, job_queue
 from src.helpers.highlight import highlight_resume_pdf_keywords
-from src.helpers.lang import get_resume_language
-
-import subprocess
-import json
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from src.helpers.preview import preview_document, render_page_png
+from src.helpers.render import render_markdown_to_pdf_bytes
+from src.helpers.tracing import start_metrics_server, traced, tracer
 
 st.set_page_config(layout="wide", page_title="AI Resume Reviewer", page_icon="📄")
 
@@ -56,112 +54,10 @@ if 'resume_text' not in st.session_state:
     st.session_state.resume_text = ""
 if 'resume_file' not in st.session_state:
     st.session_state.resume_file = None
+if 'review_jobs' not in st.session_state:
+    st.session_state.review_jobs = {}
 
-def call_local_mistral(prompt: str, model: str = "mistral") -> str:
-    """Call local Mistral/Ollama model and return raw text."""
-    result = subprocess.run(
-        ["ollama", "run", model],
-        input=prompt.encode("utf-8"),
-        capture_output=True
-    )
-    return result.stdout.decode("utf-8")
-
-def request_improved_resume(resume_text: str, job_role: str, improvements: list[str]) -> dict:
-    """Ask LLM to rewrite resume with improvements applied."""
-
-    # Detect language
-    resume_language = get_resume_language(resume_text)
-    language_instruction = (
-        f"**IMPORTANT:** All json fields MUST BE in {resume_language} language. "
-        "Both the improved_resume AND changes_log. Do not respond without ensuring this fact."
-    )
-
-    # Build the prompt directly as a formatted string
-    prompt = f"""
-You are a professional resume editor.
-Take the following resume and improve it by:
-- Fixing weaknesses
-- Applying the listed improvements
-- Keeping all factual information intact
-- Making language stronger and more professional
-
-Job Role: {job_role}
-Resume Text:
-{resume_text}
-
-{language_instruction}
-
-Return JSON in this format:
-{{
-  "improved_resume": "Improved resume text here",
-  "changes_log": ["list of changes made"]
-}}
-IMPORTANT: Respond with valid JSON ONLY. Do NOT include any text outside the JSON object. Escape quotes in resume text properly.
-RESPOND WITH JSON ONLY
-DO NOT ADD ANY EXTRA TEXT
-JSON ONLY
-ONLY JSON FORMAT
-"""
-
-    if improvements:
-        prompt += "\n\nImprovements to apply:\n- " + "\n- ".join(improvements)
-
-    # Call the LLM
-    raw_output = call_local_mistral(prompt)
-
-    # Parse JSON
-    try:
-        data = json.loads(raw_output)
-    except json.JSONDecodeError:
-        json_part = raw_output[raw_output.find("{"): raw_output.rfind("}") + 1]
-        data = json.loads(json_part)
-
-    return data
-
-def request_resume_comparison(resume_text: str, job_role: str, job_desc: str = "") -> dict:
-    """
-    Compare a resume against a job role or description.
-    Ensures output is in the same language as the resume.
-    If job_desc is empty, defaults to general expectations.
-    """
-    # Detect resume language (using your existing function)
-    resume_language = get_resume_language(resume_text)
-
-    if not job_desc.strip():
-        job_desc = f"Job description not provided. Analysis is based on general expectations for the role: {job_role}."
-
-    COMPARE_PROMPT_TEMPLATE = f"""
-    You are a professional resume reviewer. Keep the output in the same language as the resume: {resume_language}.
-    
-    Compare the following resume with the job role and/or description:
-
-    Job Role: {job_role}
-    Job Description: {job_desc}
-
-    Resume Text:
-    {resume_text}
-
-    Provide a JSON output with keys:
-    {{
-        "matched_skills": ["skills that match or are relevant"],
-        "missing_skills": ["skills expected but missing"],
-        "recommendations": ["general improvements or tailoring suggestions"]
-    }}
-
-    IMPORTANT: Your entire response must be valid JSON only. Do not add any explanatory text.
-    """
-
-    raw_output = call_local_mistral(COMPARE_PROMPT_TEMPLATE)
-
-    # Robust JSON parsing
-    try:
-        data = json.loads(raw_output)
-    except json.JSONDecodeError:
-        json_part = raw_output[raw_output.find("{"): raw_output.rfind("}") + 1]
-        data = json.loads(json_part)
-
-    return data
-
+@traced("ui_highlights")
 def display_resume_highlights(strengths, weaknesses):
     """Display exact highlighted points from resume in Streamlit."""
     html_output = "<div style='padding: 10px; max-height: 500px; overflow-y: auto; background-color: #1E1E1E; color: #F8F8F8; border-radius: 10px;'>"
@@ -183,23 +79,111 @@ def display_resume_highlights(strengths, weaknesses):
 
     st.components.v1.html(html_output, height=300, scrolling=True)
 
-def render_markdown_to_pdf_bytes(text: str) -> io.BytesIO:
-    """Render improved resume text into a PDF."""
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
+STREAMED_FIELD_LABELS = {
+    "summary": "Resume Summary",
+    "strengths": "✅ Strengths",
+    "weaknesses": "❌ Weaknesses",
+    "missing_skills": "🔍 Missing Skills",
+    "improvements": "💡 Improvements",
+}
+
+def render_streamed_field(placeholder, field: str, value) -> None:
+    """Render one feedback field while the rest of the analysis is still streaming."""
+    label = STREAMED_FIELD_LABELS[field]
+    with placeholder.container():
+        st.markdown(f"#### {label}")
+        if isinstance(value, list):
+            st.markdown("\n".join(f"- {item}" for item in value) or "_None_")
+        else:
+            st.info(value)
+
+JOB_POLL_SECONDS = 2
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def poll_job(job_id: str, pending_message: str):
+    """Wait for a background job without blocking the page; rerun the app once it finishes."""
+    job = job_queue.get(job_id)
+    if job is None or job.finished:
+        st.rerun()
+    st.info(f"{pending_message} This tab updates automatically when it is ready.")
+
+def show_job_result(job_id: str, render, pending_message: str, error_message: str):
+    """Render a background job's result, or poll for it while it is still running."""
+    job = job_queue.get(job_id)
+    if job is None:
+        st.warning("This result has expired. Please analyze your resume again.")
+    elif job.status == STATUS_DONE:
+        try:
+            render(job.result)
+        except Exception as e:
+            st.error(f"{error_message}: {e}")
+    elif job.status == STATUS_FAILED:
+        st.error(f"{error_message}: {job.error}")
+    else:
+        poll_job(job_id, pending_message)
+
+def show_pdf_preview(pdf_bytes: bytes, key: str, download_label: str, file_name: str):
+    """Show one page of a PDF as an image, with a page picker and a download of the original bytes."""
+    document = preview_document(pdf_bytes)
+    page = 1
+    if document.page_count > 1:
+        page = st.number_input("Page", min_value=1, max_value=document.page_count, value=1, step=1,
+                               key=f"{key}_page")
+    # Only the visible page is rendered and sent to the browser; other pages stay on the server
+    st.image(render_page_png(document, page - 1), caption=f"Page {page} of {document.page_count}")
+
+    st.download_button(
+        download_label,
+        data=document.data,
+        file_name=file_name,
+        mime="application/pdf",
+        key=f"{key}_download"
+    )
 
-    y = height - 50
-    for line in text.split("\n"):
-        c.drawString(50, y, line.strip())
-        y -= 15
-        if y < 50:
-            c.showPage()
-            y = height - 50
-    c.save()
+@traced("ui_improved_resume")
+def render_improved_resume(result: dict, job_role: str):
+    improved_text = result.get("improved_resume", "")
+    changes_log = result.get("changes_log", [])
+
+    # Generate improved PDF
+    pdf_stream = render_markdown_to_pdf_bytes(improved_text)
+
+    # Show changes log
+    if changes_log:
+        st.subheader("✅ Changes Made")
+        for change in changes_log:
+            st.markdown(f"- {change}")
+
+    # Show PDF preview and download
+    show_pdf_preview(
+        pdf_stream.getvalue(),
+        key="improved_resume",
+        download_label="📥 Download Improved Resume (PDF)",
+        file_name=f"improved_resume_{job_role.replace(' ', '_').lower()}.pdf"
+    )
 
-    buffer.seek(0)
-    return buffer
+@traced("ui_comparison")
+def render_comparison(comparison: dict):
+    st.subheader("✅ Matched Skills")
+    if comparison["matched_skills"]:
+        for skill in comparison["matched_skills"]:
+            st.success(f"• {skill}")
+    else:
+        st.info("No exact matches found.")
+
+    st.subheader("❌ Missing Skills")
+    if comparison["missing_skills"]:
+        for skill in comparison["missing_skills"]:
+            st.error(f"• {skill}")
+    else:
+        st.info("No missing skills identified.")
+
+    st.subheader("💡 Recommendations")
+    if comparison["recommendations"]:
+        for rec in comparison["recommendations"]:
+            st.info(f"• {rec}")
+    else:
+        st.info("No additional recommendations provided.")
 
 st.title("📄 AI Resume Reviewer")
 st.markdown("### Get a professional, data-driven analysis of your resume in seconds.")
@@ -263,18 +247,43 @@ with st.expander("🚀 Upload & Analyze Your Resume", expanded=True):
             try:
                 with st.spinner("⏳ Generating AI feedback..."):
                     if st.session_state.get("resume_file"):
-                        resume_text = extract_text_from_resume(resume)
+                        # Parsed once per file content; the other tabs reuse the same ParsedResume
+                        parsed_resume = parse_resume(st.session_state.resume_file_bytes)
+                        if parsed_resume.truncated:
+                            st.warning(f"Only the first {len(parsed_resume.pages)} of {parsed_resume.page_count} pages were analyzed.")
+                        resume_text = parsed_resume.text
                         st.session_state.resume_text = resume_text
-                    
-                    try:
-                        resume.seek(0)
-                    except Exception:
-                        pass
 
-                    feedback = get_resume_feedback(resume_text, job_role, job_description)
+                    # Rewrite and comparison run in the background while the feedback streams in
+                    st.session_state.review_jobs = start_review_tasks(
+                        resume_text, job_role, job_description,
+                        tasks=(TASK_IMPROVED_RESUME, TASK_COMPARISON)
+                    )
+
+                    # Show each field as soon as the model finishes it instead of waiting for the whole answer
+                    live_results = st.container()
+                    placeholders = {field: live_results.empty() for field in STREAMED_FIELD_LABELS}
+                    feedback = None
+                    # The first paste gets the single streamed prompt. Once the text is edited the session
+                    # switches to per-section analysis for good, so from then on only changed sections are
+                    # sent to the LLM again (and an unchanged re-run hits the same cached review)
+                    previous_paste = st.session_state.get("last_pasted_resume")
+                    if not st.session_state.get("resume_file") and previous_paste is not None \
+                            and previous_paste != resume_text:
+                        st.session_state.pasted_sectioned = True
+                    incremental = not st.session_state.get("resume_file") \
+                        and st.session_state.get("pasted_sectioned", False)
+                    for field, value in stream_resume_feedback(resume_text, job_role, job_description,
+                                                               incremental=incremental):
+                        if field == "feedback":
+                            feedback = value
+                        elif field in placeholders:
+                            render_streamed_field(placeholders[field], field, value)
                     
                     # Store feedback in session state
                     st.session_state.feedback = feedback
+                    if not st.session_state.get("resume_file"):
+                        st.session_state.last_pasted_resume = resume_text
                     st.session_state.job_role = job_role
                     
                     # Force re-render
@@ -327,8 +336,9 @@ if st.session_state.feedback:
                     len(feedback.improvements)
                 ],
             }
-            df = pd.DataFrame(data)
-            fig_bar = px.bar(df, x="Category", y="Count", title="Analysis Breakdown", text="Count")
+            # plotly (and the pandas it pulls in) is only needed once there is a result to chart
+            import plotly.express as px
+            fig_bar = px.bar(data, x="Category", y="Count", title="Analysis Breakdown", text="Count")
             fig_bar.update_traces(marker_color=['#2CA02C', '#D62728', '#FF7F0E', '#1F77B4'])
             fig_bar.update_layout(showlegend=False)
             st.plotly_chart(fig_bar, use_container_width=True)
@@ -371,55 +381,16 @@ if st.session_state.feedback:
     with tab2:
         st.header("Improved Resume (PDF)")
 
-        try:
-            resume_text = None
-
-            # Case 1: user pasted text
-            if st.session_state.get("resume_text"):
-                resume_text = st.session_state.resume_text
-
-            # Case 2: user uploaded PDF
-            elif st.session_state.get("resume_file"):
-                # Read bytes only when needed
-                if not st.session_state.get("resume_file_bytes"):
-                    st.session_state.resume_file_bytes = st.session_state.resume_file.read()
-                resume_text = extract_text_from_resume(io.BytesIO(st.session_state.resume_file_bytes))
-
-            if resume_text:
-                with st.spinner("✨ Improving your resume..."):
-                    result = request_improved_resume(
-                        resume_text,
-                        job_role,
-                        feedback.improvements or []
-                    )
-                    improved_text = result.get("improved_resume", "")
-                    changes_log = result.get("changes_log", [])
-
-                    # Generate improved PDF
-                    pdf_stream = render_markdown_to_pdf_bytes(improved_text)
-
-                    # Show changes log
-                    if changes_log:
-                        st.subheader("✅ Changes Made")
-                        for change in changes_log:
-                            st.markdown(f"- {change}")
-
-                    # Show PDF inline
-                    b64 = base64.b64encode(pdf_stream.getvalue()).decode("utf-8")
-                    iframe = f'<iframe src="data:application/pdf;base64,{b64}" width="700" height="1000"></iframe>'
-                    st.components.v1.html(iframe, height=1100)
-
-                    # Download button
-                    st.download_button(
-                        "📥 Download Improved Resume (PDF)",
-                        data=pdf_stream,
-                        file_name=f"improved_resume_{job_role.replace(' ', '_').lower()}.pdf",
-                        mime="application/pdf"
-                    )
-            else:
-                st.warning("Resume text not available.")
-        except Exception as e:
-            st.error(f"Error generating improved resume: {e}")
+        improved_job_id = st.session_state.review_jobs.get(TASK_IMPROVED_RESUME)
+        if improved_job_id:
+            show_job_result(
+                improved_job_id,
+                lambda result: render_improved_resume(result, job_role),
+                pending_message="✨ Improving your resume...",
+                error_message="Error generating improved resume"
+            )
+        else:
+            st.warning("Resume text not available.")
 
     with tab3:
         if st.session_state.get("resume_file_bytes"):
@@ -428,25 +399,18 @@ if st.session_state.feedback:
                 weaknesses=feedback.highlighted_weaknesses or []
             )
 
-            pdf_bytes = io.BytesIO(st.session_state.resume_file_bytes)
-
             highlighted_pdf = highlight_resume_pdf_keywords(
-                pdf_bytes,
+                parse_resume(st.session_state.resume_file_bytes),
                 strengths=feedback.highlighted_strengths or [],
                 weaknesses=feedback.highlighted_weaknesses or []
             )
 
             # Display in Streamlit
-            b64_pdf = base64.b64encode(highlighted_pdf.getvalue()).decode("utf-8")
-            pdf_display = f'<iframe src="data:application/pdf;base64,{b64_pdf}" width="700" height="1000"></iframe>'
-            st.components.v1.html(pdf_display, height=1100, scrolling=True)
-
-            # Download button
-            st.download_button(
-                label="📥 Download Highlighted Resume",
-                data=highlighted_pdf.getvalue(),
-                file_name="highlighted_resume.pdf",
-                mime="application/pdf"
+            show_pdf_preview(
+                highlighted_pdf.getvalue(),
+                key="highlighted_resume",
+                download_label="📥 Download Highlighted Resume",
+                file_name="highlighted_resume.pdf"
             )
 
         elif st.session_state.get("resume_text"):
@@ -461,49 +425,18 @@ if st.session_state.feedback:
 
     
     with tab4:
-        try:
-            resume_text = None
-
-            # Case 1: user pasted text
-            if st.session_state.get("resume_text"):
-                resume_text = st.session_state.resume_text
-
-            # Case 2: user uploaded PDF (use cached bytes!)
-            elif st.session_state.get("resume_file_bytes"):
-                resume_text = extract_text_from_resume(io.BytesIO(st.session_state.resume_file_bytes))
-
-            if resume_text:
-                with st.spinner("✨ Comparing Resume with the Job Description..."):
-                    st.header(f"📋 Resume vs Job Description for {job_role}")
-                    if job_description.strip():
-                        comparison = request_resume_comparison(resume_text, job_description, job_role)
-                        
-                        st.subheader("✅ Matched Skills")
-                        if comparison["matched_skills"]:
-                            for skill in comparison["matched_skills"]:
-                                st.success(f"• {skill}")
-                        else:
-                            st.info("No exact matches found.")
-
-                        st.subheader("❌ Missing Skills")
-                        if comparison["missing_skills"]:
-                            for skill in comparison["missing_skills"]:
-                                st.error(f"• {skill}")
-                        else:
-                            st.info("No missing skills identified.")
-
-                        st.subheader("💡 Recommendations")
-                        if comparison["recommendations"]:
-                            for rec in comparison["recommendations"]:
-                                st.info(f"• {rec}")
-                        else:
-                            st.info("No additional recommendations provided.")
-                    else:
-                        st.warning("Please provide a job description to compare against.")
-            else:
-                st.warning("Resume text not available.")
-        except Exception as e:
-            st.error(f"Error generating resume comparison: {e}")
+        st.header(f"📋 Resume vs Job Description for {job_role}")
+
+        comparison_job_id = st.session_state.review_jobs.get(TASK_COMPARISON)
+        if comparison_job_id:
+            show_job_result(
+                comparison_job_id,
+                render_comparison,
+                pending_message="✨ Comparing Resume with the Job Description...",
+                error_message="Error generating resume comparison"
+            )
+        else:
+            st.warning("Please provide a job description to compare against.")
 
 
 
@@ -526,4 +459,26 @@ st.markdown(
     "Powered by AI Resume Reviewer • Uses Mistral LLM via Ollama"
     "</div>",
     unsafe_allow_html=True
-)
\ No newline at end of file
+)
+
+# Stage timings, only when tracing is on (RESUME_REVIEWER_TRACING=1); drawn last so this run is included
+if tracer.enabled:
+    start_metrics_server()
+    with st.sidebar.expander("⏱️ Stage timings (debug)"):
+        stage_rows = tracer.snapshot()
+        if stage_rows:
+            st.dataframe(stage_rows, hide_index=True)
+        else:
+            st.caption("No stages recorded yet.")
+        model_rows = router.latency_report()
+        if model_rows:
+            st.caption("LLM latency by task and model")
+            st.dataframe(model_rows, hide_index=True)
+        usage_rows = [{"task": task, **totals} for task, totals in get_client().usage_totals().items()]
+        if usage_rows:
+            st.caption("LLM token usage by task (recent calls)")
+            st.dataframe(usage_rows, hide_index=True)
+        parse_rows = [{"task": task, **counts} for task, counts in parse_metrics.snapshot().items()]
+        if parse_rows:
+            st.caption("Structured output parsing (failures, repairs)")
+            st.dataframe(parse_rows, hide_index=True)
\ No newline at end of file
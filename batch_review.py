@@ -0,0 +1,193 @@
+"""Review a directory (or glob) of resume PDFs against one job role without the Streamlit UI.
+
+Results are appended to a JSONL file as each resume finishes. Re-running with
+the same output file skips resumes that were already reviewed successfully.
+
+    python batch_review.py resumes/ --role "Data Scientist" --jd jd.txt --output results.jsonl
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from src.parsing.document import parse_resume
+from src.llm.reviewer import get_resume_feedback
+
+# Parse workers are started while the LLM threads run; a forked child could inherit one of their held locks
+_SPAWN = multiprocessing.get_context("spawn")
+
+
+def collect_pdfs(source: str, recursive: bool = False) -> list[str]:
+    """Expand a directory or glob pattern into a sorted list of PDF paths"""
+    if os.path.isdir(source):
+        pattern = "**/*.pdf" if recursive else "*.pdf"
+        paths = Path(source).glob(pattern)
+        return sorted(str(p) for p in paths if p.is_file())
+    return sorted(p for p in glob.glob(source, recursive=recursive) if p.lower().endswith(".pdf"))
+
+
+def load_completed(output_path: str) -> set[str]:
+    """Files that already have a successful result in the output file"""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write can leave a truncated last line
+                continue
+            if record.get("status") == "ok":
+                completed.add(record["file"])
+    return completed
+
+
+def _parse_resume(path: str) -> tuple[str, float, list[dict]]:
+    start = time.perf_counter()
+    # Already one process per file, so don't fan pages out to another pool
+    parsed = parse_resume(path, workers=1)
+    return parsed.text, time.perf_counter() - start, parsed.report()
+
+
+def _try_parse_resume(path: str) -> tuple[str, float, list[dict], str | None]:
+    """_parse_resume that reports failure as its last field instead of raising"""
+    try:
+        return (*_parse_resume(path), None)
+    except Exception as e:
+        return "", 0.0, [], str(e)
+
+
+def triage(paths: list[str], job_role: str, job_description: str | None, top_k: int,
+           parse_workers: int | None = None) -> tuple[list[str], dict[str, tuple]]:
+    """Keep only the top_k resumes by keyword match, so the LLM only sees the best candidates.
+
+    Returns the selected paths and their parse results, so run_batch does not
+    parse them again. A file that fails to parse ranks as empty instead of
+    aborting the batch.
+    """
+    # numpy/scipy are only worth loading when --top-k is used
+    from src.llm.triage import top_k_candidates
+
+    with ProcessPoolExecutor(max_workers=parse_workers, mp_context=_SPAWN) as pool:
+        results = list(pool.map(_try_parse_resume, paths, chunksize=8))
+    for path, (_, _, _, error) in zip(paths, results):
+        if error:
+            print(f"[triage] could not parse {path}: {error}", file=sys.stderr)
+    ranked = top_k_candidates([text for text, *_ in results], [job_description or job_role], k=top_k)[0]
+    for i, score in ranked:
+        print(f"[triage] {score:6.2f}  {paths[i]}", file=sys.stderr)
+    selected = [paths[i] for i, _ in ranked]
+    return selected, {paths[i]: results[i] for i, _ in ranked}
+
+
+def _review_resume(text: str, job_role: str, job_description: str | None) -> tuple[dict, float]:
+    start = time.perf_counter()
+    feedback = get_resume_feedback(text, job_role, job_description)
+    return feedback.model_dump(), time.perf_counter() - start
+
+
+def run_batch(paths: list[str], job_role: str, job_description: str | None, output_path: str,
+              parse_workers: int | None = None, llm_concurrency: int = 2,
+              parsed: dict[str, tuple] | None = None) -> dict:
+    """Parse resumes in a process pool and review them with bounded LLM concurrency.
+
+    `parsed` maps paths already parsed (e.g. by triage) to their
+    _try_parse_resume result; those go straight to the LLM stage.
+    Returns counts of ok/error records written by this run.
+    """
+    parsed = parsed or {}
+    counts = {"ok": 0, "error": 0}
+
+    with open(output_path, "a", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=parse_workers, mp_context=_SPAWN) as parse_pool, \
+            ThreadPoolExecutor(max_workers=llm_concurrency) as llm_pool:
+
+        def write(record: dict) -> None:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            counts[record["status"]] += 1
+            print(f"[{record['status']}] {record['file']}", file=sys.stderr)
+
+        pending = {}
+        for path in paths:
+            if path not in parsed:
+                pending[parse_pool.submit(_parse_resume, path)] = (path, None, None)
+                continue
+            text, parse_seconds, pages, error = parsed[path]
+            if error:
+                write({"file": path, "status": "error", "error": error, "timings": {"parse_s": None}})
+            else:
+                pending[llm_pool.submit(_review_resume, text, job_role, job_description)] = (path, parse_seconds, pages)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, parse_seconds, pages = pending.pop(future)
+                try:
+                    if parse_seconds is None:
+                        # Parsing finished: hand the text to the LLM stage
+                        text, parse_seconds, pages = future.result()
+                        pending[llm_pool.submit(_review_resume, text, job_role, job_description)] = (path, parse_seconds, pages)
+                        continue
+                    feedback, review_seconds = future.result()
+                except Exception as e:
+                    write({"file": path, "status": "error", "error": str(e),
+                           "timings": {"parse_s": parse_seconds}})
+                    continue
+                write({
+                    "file": path,
+                    "status": "ok",
+                    "feedback": feedback,
+                    "timings": {
+                        "parse_s": round(parse_seconds, 4),
+                        "review_s": round(review_seconds, 4),
+                        "pages": pages,
+                    },
+                })
+
+    return counts
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Batch-review resume PDFs against a job role.")
+    parser.add_argument("source", help="Directory of PDFs or a glob pattern such as 'cvs/**/*.pdf'")
+    parser.add_argument("--role", required=True, help="Target job role")
+    parser.add_argument("--jd", help="Path to a job description text file")
+    parser.add_argument("--output", default="batch_results.jsonl", help="JSONL file to append results to")
+    parser.add_argument("--recursive", action="store_true", help="Search subdirectories too")
+    parser.add_argument("--parse-workers", type=int, default=None, help="PDF parsing processes (default: CPU count)")
+    parser.add_argument("--llm-concurrency", type=int, default=2, help="Concurrent LLM requests")
+    parser.add_argument("--top-k", type=int, default=None,
+                        help="Only send the K best keyword matches to the LLM")
+    args = parser.parse_args(argv)
+
+    job_description = None
+    if args.jd:
+        with open(args.jd, "r", encoding="utf-8") as f:
+            job_description = f.read()
+
+    paths = collect_pdfs(args.source, recursive=args.recursive)
+    completed = load_completed(args.output)
+
+    start = time.perf_counter()
+    parsed = None
+    if args.top_k:
+        # Rank every file, not just the unfinished ones, so a resumed run keeps the same top K
+        paths, parsed = triage(paths, args.role, job_description, args.top_k, parse_workers=args.parse_workers)
+    todo = [p for p in paths if p not in completed]
+    print(f"{len(paths)} PDFs selected, {len(paths) - len(todo)} already reviewed, {len(todo)} to go",
+          file=sys.stderr)
+    counts = run_batch(todo, args.role, job_description, args.output,
+                       parse_workers=args.parse_workers, llm_concurrency=args.llm_concurrency, parsed=parsed)
+    print(f"Done in {time.perf_counter() - start:.1f}s: {counts['ok']} ok, {counts['error']} failed",
+          file=sys.stderr)
+    return 0 if counts["error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
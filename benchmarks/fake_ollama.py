@@ -0,0 +1,125 @@
+"""Minimal stand-in for the Ollama HTTP API, so benchmarks run offline with predictable latency.
+
+Implements /api/generate (streamed and not) and /api/embed. Generations
+return a canned JSON object shaped by the `format` schema of the request, so
+schema-validated callers accept it. Latency is split into a fixed delay
+before the first token and a delay per streamed chunk.
+
+    python -m benchmarks.fake_ollama --port 11500 --latency 0.5 --token-latency 0.005
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FEEDBACK = {
+    "summary": "Solid resume with relevant data engineering experience.",
+    "missing_skills": ["Kubernetes", "Airflow"],
+    "weaknesses": ["Few quantified results"],
+    "strengths": ["Built ETL pipelines in Python"],
+    "improvements": ["Quantify the impact of each project"],
+    "highlighted_strengths": ["Python"],
+    "highlighted_weaknesses": [],
+    "score": 72,
+}
+IMPROVED_RESUME = {
+    "improved_resume": "# Alex Johnson\n\n## Experience\n- Built ETL pipelines in Python\n",
+    "changes_log": ["Quantified project impact"],
+}
+COMPARISON = {
+    "matched_skills": ["Python", "SQL"],
+    "missing_skills": ["Kubernetes"],
+    "recommendations": ["Mention cloud deployments"],
+}
+EMBED_DIM = 64
+
+
+def payload_for(request: dict) -> dict:
+    """Pick the canned reply whose keys match the schema the caller asked for"""
+    fmt = request.get("format")
+    required = set(fmt.get("required", ())) if isinstance(fmt, dict) else set()
+    for payload in (IMPROVED_RESUME, COMPARISON):
+        if required and required == payload.keys():
+            return payload
+    return FEEDBACK
+
+
+def fake_embedding(text: str) -> list[float]:
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return [(digest[i % len(digest)] - 128) / 128 for i in range(EMBED_DIM)]
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    token_latency = 0.0
+    chunk_chars = 8
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body: bytes, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        # Ollama answers its root path with a plain status line
+        self._send(b"Ollama is running", "text/plain")
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.path == "/api/embed":
+            inputs = request.get("input") or []
+            inputs = [inputs] if isinstance(inputs, str) else inputs
+            body = {"model": request.get("model"), "embeddings": [fake_embedding(t) for t in inputs]}
+            self._send(json.dumps(body).encode(), "application/json")
+            return
+        if self.path != "/api/generate":
+            self.send_error(404)
+            return
+
+        text = json.dumps(payload_for(request))
+        chunks = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)]
+        base = {"model": request.get("model"), "created_at": "2024-01-01T00:00:00Z"}
+        final = dict(base, response="", done=True, prompt_eval_count=len(request.get("prompt", "")) // 4,
+                     eval_count=len(chunks))
+        # The whole generation time is slept up front, so the body goes out with a known length
+        time.sleep(self.latency + self.token_latency * len(chunks))
+        if request.get("stream", True):
+            lines = [json.dumps(dict(base, response=c, done=False)) for c in chunks] + [json.dumps(final)]
+            self._send(("\n".join(lines) + "\n").encode(), "application/x-ndjson")
+        else:
+            self._send(json.dumps(dict(final, response=text)).encode(), "application/json")
+
+
+def start_fake_ollama(port: int = 0, latency: float = 0.0, token_latency: float = 0.0) -> ThreadingHTTPServer:
+    """Serve the fake API on a background thread; the bound port is `server.server_address[1]`"""
+    handler = type("ConfiguredHandler", (FakeOllamaHandler,),
+                   {"latency": latency, "token_latency": token_latency})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a fake Ollama server for offline testing.")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before the first token")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Seconds per streamed chunk")
+    args = parser.parse_args(argv)
+    server = start_fake_ollama(args.port, args.latency, args.token_latency)
+    print(f"Fake Ollama listening on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Measure the cold import cost of the app's entry modules and check it against a budget.
+
+Each module is imported in a fresh interpreter with `python -X importtime`,
+so nothing is shared between measurements. The report lists the total time
+per module and which packages it spends that time in. The exit code is 1 if
+any module is over budget or loads a heavy dependency (PDF engines, reportlab,
+numpy, plotly, the Ollama client, ...) that should only load on first use.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time src.llm.reviewer --budget-ms 200 --top 15
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+DEFAULT_MODULES = (
+    "src.llm.reviewer",
+    "src.llm.client",
+    "src.parsing.document",
+    "src.helpers.highlight",
+    "src.helpers.render",
+    "src.helpers.preview",
+    "review_server",
+    "batch_review",
+)
+# Imported inside the functions that need them; loading any of these at import time is a regression
+DEFERRED_PACKAGES = ("fitz", "pymupdf", "pdfplumber", "reportlab", "langdetect", "numpy", "scipy",
+                     "pandas", "plotly", "ollama", "httpx")
+DEFAULT_BUDGET_MS = 250.0
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, float, float]]:
+    """[(module, self_ms, cumulative_ms), ...] from `-X importtime` output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header row
+        rows.append((fields[2].strip(), int(fields[0]) / 1000, int(fields[1]) / 1000))
+    return rows
+
+
+def _group(module: str) -> str:
+    # Our own modules are reported one by one, third-party ones per top-level package
+    return module if module.startswith("src.") else module.split(".")[0]
+
+
+def measure_import(module: str, repeat: int = 3) -> dict:
+    """Import `module` in `repeat` fresh interpreters and keep the fastest run"""
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                cwd=REPO_ROOT, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+        rows = parse_importtime(result.stderr)
+        total = next((cumulative for name, _, cumulative in rows if name == module), 0.0)
+        if best is None or total < best[0]:
+            best = (total, rows)
+
+    total, rows = best
+    by_package: dict[str, float] = {}
+    for name, self_ms, _ in rows:
+        by_package[_group(name)] = by_package.get(_group(name), 0.0) + self_ms
+    loaded = {name.split(".")[0] for name, _, _ in rows}
+    return {
+        "total_ms": round(total, 1),
+        "packages": {name: round(ms, 1) for name, ms in sorted(by_package.items(), key=lambda kv: -kv[1])},
+        "deferred_loaded": sorted(loaded.intersection(DEFERRED_PACKAGES)),
+    }
+
+
+def check(report: dict, budget_ms: float) -> list[str]:
+    """Human-readable budget violations, empty when everything passes"""
+    problems = []
+    for module, stats in report.items():
+        if stats["total_ms"] > budget_ms:
+            problems.append(f"{module}: {stats['total_ms']:.1f} ms exceeds the {budget_ms:.0f} ms budget")
+        if stats["deferred_loaded"]:
+            problems.append(f"{module}: imports {', '.join(stats['deferred_loaded'])} eagerly")
+    return problems
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Report per-module import cost and enforce a cold-start budget.")
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES), help="Modules to import")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Allowed cumulative import time per module")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module; the fastest counts")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest packages to list per module")
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = {module: measure_import(module, args.repeat) for module in args.modules}
+
+    for module, stats in report.items():
+        print(f"{module:<45} {stats['total_ms']:>10.1f} ms", file=sys.stderr)
+        for name, ms in list(stats["packages"].items())[:args.top]:
+            print(f"    {name:<41} {ms:>10.1f} ms", file=sys.stderr)
+
+    problems = check(report, args.budget_ms)
+    for problem in problems:
+        print(f"OVER BUDGET {problem}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"budget_ms": args.budget_ms, "modules": report, "problems": problems}, f, indent=2)
+            f.write("\n")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
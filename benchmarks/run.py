@@ -0,0 +1,197 @@
+"""Time the hot paths of the reviewer on synthetic resumes and compare against a stored baseline.
+
+Everything runs offline: PDFs are generated with reportlab and the LLM is a
+fake Ollama server with configurable latency. Results are written as JSON;
+with --baseline, any benchmark whose median is slower than the baseline by
+more than the threshold is reported and the exit code is 1.
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Optional
+
+from benchmarks.fake_ollama import FEEDBACK, start_fake_ollama
+from benchmarks.synthetic import make_improved_resume_markdown, make_resume_pdf
+
+DEFAULT_PAGES = (1, 5, 10, 20)
+DEFAULT_THRESHOLD = 0.25
+# Differences below this are timer noise, whatever the ratio
+MIN_DELTA_MS = 1.0
+JOB_ROLE = "Data Engineer"
+JOB_DESCRIPTION = ("We are hiring a data engineer to build Python and SQL pipelines on AWS with Airflow, "
+                   "Spark and Kafka. Experience with Docker, Kubernetes and Terraform is a plus.")
+
+
+def time_calls(fn: Callable[[], object], repeat: int, setup: Optional[Callable[[], None]] = None,
+               number: int = 1) -> dict:
+    """Run fn `repeat` times (after one warm-up) and summarise the per-call time in milliseconds.
+
+    `setup` runs untimed before every call, e.g. to clear memoization so each
+    call does the full work; `number` batches very fast calls per sample.
+    """
+    if setup:
+        setup()
+    fn()
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) * 1000 / number)
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "min_ms": round(min(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "repeat": repeat,
+    }
+
+
+def run_benchmarks(pages: tuple[int, ...] = DEFAULT_PAGES, repeat: int = 5,
+                   llm_latency: float = 0.05, token_latency: float = 0.0) -> dict:
+    """Run every benchmark and return {"meta": ..., "results": {name: stats}}"""
+    server = start_fake_ollama(latency=llm_latency, token_latency=token_latency)
+    os.environ["OLLAMA_HOST"] = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ.setdefault("RESUME_REVIEWER_CACHE_DIR", tempfile.mkdtemp(prefix="resume-bench-"))
+
+    # Imported only now, since these modules read the environment at import time
+    from src.helpers import highlight, render
+    from src.helpers.lang import get_resume_language
+    from src.llm.reviewer import build_prompt, extract_json_from_text, get_resume_feedback
+    from src.parsing import document
+    from src.parsing.parser import extract_text_from_resume
+
+    def clear_parsed():
+        document._parsed.clear()
+
+    def clear_highlighted():
+        highlight._highlighted.clear()
+
+    def clear_rendered():
+        render._rendered.clear()
+
+    results = {}
+    try:
+        for n in pages:
+            pdf = make_resume_pdf(n)
+            results[f"extract_text_from_resume[pages={n}]"] = time_calls(
+                lambda: extract_text_from_resume(io.BytesIO(pdf)), repeat, setup=clear_parsed)
+
+            parsed = document.parse_resume(io.BytesIO(pdf))
+            text = parsed.text
+            lines = [line.strip() for line in text.splitlines() if line.strip().startswith("-")]
+            strengths = [line.lstrip("- ") for line in lines[:5]]
+            weaknesses = [line.lstrip("- ") for line in lines[5:8]]
+            results[f"highlight_resume_pdf_keywords[pages={n}]"] = time_calls(
+                lambda: highlight.highlight_resume_pdf_keywords(parsed, strengths, weaknesses),
+                repeat, setup=clear_highlighted)
+
+            results[f"build_prompt[pages={n}]"] = time_calls(
+                lambda: build_prompt(text, JOB_ROLE, JOB_DESCRIPTION), repeat,
+                setup=get_resume_language.cache_clear)
+
+            markdown = make_improved_resume_markdown(n)
+            results[f"render_markdown_to_pdf_bytes[pages={n}]"] = time_calls(
+                lambda: render.render_markdown_to_pdf_bytes(markdown), repeat, setup=clear_rendered)
+
+            # Short resumes take the single-prompt path, longer ones are analyzed per section
+            results[f"get_resume_feedback[pages={n}]"] = time_calls(
+                lambda: get_resume_feedback(text, JOB_ROLE, JOB_DESCRIPTION, use_cache=False), repeat)
+
+        raw = json.dumps(FEEDBACK)
+        results["extract_json_from_text[plain]"] = time_calls(lambda: extract_json_from_text(raw), repeat,
+                                                             number=1000)
+        fenced = f"Here is the analysis:\n```json\n{json.dumps(FEEDBACK, indent=2)}\n```"
+        results["extract_json_from_text[fenced]"] = time_calls(lambda: extract_json_from_text(fenced), repeat,
+                                                              number=1000)
+    finally:
+        server.shutdown()
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "pages": list(pages),
+            "llm_latency": llm_latency,
+            "token_latency": token_latency,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    """Benchmarks whose median regressed past the threshold.
+
+    The baseline may carry a "thresholds" map from benchmark name (with or
+    without the [..] parameters) to its own allowed slowdown ratio.
+    """
+    overrides = baseline.get("thresholds", {})
+    regressions = []
+    for name, stats in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        allowed = overrides.get(name, overrides.get(name.split("[")[0], threshold))
+        before, after = base["median_ms"], stats["median_ms"]
+        if after > before * (1 + allowed) and after - before > MIN_DELTA_MS:
+            regressions.append({"name": name, "baseline_ms": before, "current_ms": after,
+                                "ratio": round(after / before, 2) if before else None, "threshold": allowed})
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark resume parsing, prompting, rendering and review.")
+    parser.add_argument("--pages", type=int, nargs="+", default=list(DEFAULT_PAGES),
+                        help="Synthetic resume sizes to benchmark (1-20 pages)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake Ollama delay per generation (s)")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Fake Ollama delay per chunk (s)")
+    parser.add_argument("--output", help="Write results JSON here instead of stdout")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown ratio before a benchmark counts as a regression")
+    parser.add_argument("--save-baseline", help="Also write the results as a new baseline file")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(tuple(args.pages), args.repeat, args.llm_latency, args.token_latency)
+
+    for name, stats in report["results"].items():
+        print(f"{name:<45} {stats['median_ms']:>10.3f} ms", file=sys.stderr)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["regressions"] = compare(report, baseline, args.threshold)
+        for r in report["regressions"]:
+            print(f"REGRESSION {r['name']}: {r['baseline_ms']} ms -> {r['current_ms']} ms "
+                  f"(x{r['ratio']}, allowed x{1 + r['threshold']:.2f})", file=sys.stderr)
+        status = 1 if report["regressions"] else 0
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"meta": report["meta"], "results": report["results"]}, f, indent=2)
+            f.write("\n")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Deterministic synthetic resume PDFs of a chosen page count, built with reportlab."""
+import io
+import random
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+SKILLS = ["Python", "SQL", "Spark", "Airflow", "Docker", "Kubernetes", "Terraform", "AWS", "GCP",
+          "Pandas", "scikit-learn", "PyTorch", "Kafka", "PostgreSQL", "Tableau", "Git", "Linux"]
+VERBS = ["Built", "Designed", "Led", "Automated", "Migrated", "Optimized", "Deployed", "Maintained"]
+OBJECTS = ["ETL pipelines", "a feature store", "dashboards for finance", "CI/CD workflows",
+           "a recommendation model", "data quality checks", "streaming ingestion", "cost reports"]
+RESULTS = ["cutting runtime by {n}%", "serving {n}k daily users", "saving ${n}k per year",
+           "reducing incidents by {n}%", "improving accuracy by {n} points"]
+
+LINE_HEIGHT = 14
+MARGIN = 50
+
+
+def resume_lines(pages: int, seed: int = 0) -> list[str]:
+    """Enough resume-like lines to fill roughly `pages` letter pages"""
+    rng = random.Random(seed)
+    per_page = int((letter[1] - 2 * MARGIN) // LINE_HEIGHT)
+    lines = ["Alex Johnson", "Data Engineer | alex.johnson@example.com | (555) 123-4567", "",
+             "Professional Summary",
+             "Data engineer with experience building reliable pipelines and analytics platforms.", "",
+             "Skills", ", ".join(rng.sample(SKILLS, 10)), "", "Experience"]
+    job = 0
+    while len(lines) < pages * per_page:
+        if job % 4 == 0:
+            lines += ["", f"Senior Engineer, Company {job // 4 + 1} ({2020 - job // 4} - {2021 - job // 4})"]
+        bullet = (f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} with {rng.choice(SKILLS)}, "
+                  f"{rng.choice(RESULTS).format(n=rng.randint(5, 60))}")
+        lines.append(bullet)
+        job += 1
+    lines = lines[:pages * per_page - 3] + ["", "Education", "B.Sc. Computer Science, State University"]
+    return lines
+
+
+def make_resume_pdf(pages: int, seed: int = 0) -> bytes:
+    """A text-based resume PDF with exactly `pages` pages"""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    c.setFont("Helvetica", 10)
+    height = letter[1]
+    y = height - MARGIN
+    for line in resume_lines(pages, seed):
+        if y < MARGIN:
+            c.showPage()
+            c.setFont("Helvetica", 10)
+            y = height - MARGIN
+        c.drawString(MARGIN, y, line)
+        y -= LINE_HEIGHT
+    c.save()
+    return buffer.getvalue()
+
+
+def make_improved_resume_markdown(pages: int, seed: int = 0) -> str:
+    """Markdown-ish rewrite text of about the same length, for the PDF renderer benchmark"""
+    out = []
+    for line in resume_lines(pages, seed):
+        if line in ("Professional Summary", "Skills", "Experience", "Education"):
+            out.append(f"## {line}")
+        else:
+            out.append(line)
+    return "\n".join(out)
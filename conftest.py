@@ -0,0 +1 @@
+"""Lets pytest import the root-level scripts (review_server, batch_review) and the src namespace package."""
@@ -0,0 +1,310 @@
+"""Serve the reviewer over HTTP so other systems (e.g. an ATS) can call it without the Streamlit UI.
+
+    python review_server.py --port 8600
+
+Endpoints (all POST, JSON responses):
+    /v1/feedback          ResumeFeedback for a resume, job role and optional job description
+    /v1/improved-resume   rewritten resume and change log
+    /v1/comparison        matched/missing skills and recommendations against the job description
+
+The body is either JSON with `resume_text` or `resume_pdf_base64`, plus
+`job_role`, `job_description` (and `improvements` for the rewrite), or the raw
+PDF bytes with Content-Type application/pdf and the other fields as query
+parameters. GET /healthz reports liveness, Ollama backend health, recent token usage and
+structured-output parse failures; GET /metrics the tracing histograms and counters.
+
+Connections are handled on one asyncio loop; the blocking parse and LLM work
+runs in a thread pool. Identical requests that arrive while one is already
+running share its result instead of starting another generation.
+"""
+import argparse
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from src.helpers.cache import content_key, normalize_text
+from src.helpers.tracing import tracer
+from src.llm.client import LLMError, get_client
+from src.llm.reviewer import get_resume_feedback, request_improved_resume, request_resume_comparison
+from src.llm.structured import StructuredOutputError, parse_metrics
+from src.parsing.document import parse_resume
+
+MAX_BODY_BYTES = int(os.environ.get("RESUME_REVIEWER_MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+SERVICE_WORKERS = int(os.environ.get("RESUME_REVIEWER_SERVICE_WORKERS", "16"))
+# Request fields that must be strings when present; `improvements` must be a list of strings
+STRING_FIELDS = ("resume_text", "resume_pdf_base64", "job_role", "job_description")
+# Idle keep-alive connections are closed after this many seconds
+IDLE_TIMEOUT = 60.0
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 502: "Bad Gateway"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class SingleFlight:
+    """Coalesce identical in-flight calls: the first caller starts the work, every caller awaits its result.
+
+    The work runs as its own task, so a caller that goes away (e.g. a client
+    disconnect cancels its handler) never leaves the others waiting. Entries
+    are removed as soon as the work finishes, so this never serves stale
+    results; repeated requests after that hit the review caches instead.
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    def _finished(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Callers get the exception themselves; mark it retrieved so it is not logged again at shutdown
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: str, work: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """Return (result, shared) where shared is True if another caller's run was reused"""
+        task = self._inflight.get(key)
+        shared = task is not None
+        if shared:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(work())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task), shared
+
+
+class ReviewService:
+    """Routes requests to the reviewer functions, running them in a thread pool"""
+
+    def __init__(self, workers: int = SERVICE_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="review-http")
+        self.single_flight = SingleFlight()
+        self.routes = {
+            "/v1/feedback": self._feedback,
+            "/v1/improved-resume": self._improved_resume,
+            "/v1/comparison": self._comparison,
+        }
+
+    @staticmethod
+    def _feedback(text: str, request: dict) -> dict:
+        return get_resume_feedback(text, request["job_role"], request.get("job_description")).model_dump()
+
+    @staticmethod
+    def _improved_resume(text: str, request: dict) -> dict:
+        return request_improved_resume(text, request["job_role"], request.get("improvements"))
+
+    @staticmethod
+    def _comparison(text: str, request: dict) -> dict:
+        return request_resume_comparison(text, request["job_role"], request.get("job_description") or "")
+
+    @staticmethod
+    def _resume_text(request: dict) -> str:
+        if request.get("resume_pdf") is not None:
+            try:
+                return parse_resume(request["resume_pdf"]).text
+            except Exception as e:
+                # PyMuPDF raises its own error types for corrupt or non-PDF data; it is the caller's input
+                raise HTTPError(400, f"Could not read the PDF: {e}")
+        return request.get("resume_text") or ""
+
+    def _request_key(self, path: str, request: dict) -> str:
+        resume = request.get("resume_pdf")
+        resume_part = hashlib.sha256(resume).hexdigest() if resume is not None \
+            else normalize_text(request.get("resume_text"))
+        return content_key(path, resume_part, normalize_text(request.get("job_role")),
+                           normalize_text(request.get("job_description")),
+                           json.dumps(request.get("improvements") or []))
+
+    async def handle(self, path: str, request: dict) -> tuple[dict, bool]:
+        handler = self.routes.get(path)
+        if handler is None:
+            raise HTTPError(404, f"Unknown endpoint {path}")
+        if not (request.get("job_role") or "").strip():
+            raise HTTPError(400, "job_role is required")
+        if request.get("resume_pdf") is None and not (request.get("resume_text") or "").strip():
+            raise HTTPError(400, "Provide resume_text, resume_pdf_base64 or a PDF body")
+
+        loop = asyncio.get_running_loop()
+
+        def run() -> dict:
+            return handler(self._resume_text(request), request)
+
+        return await self.single_flight.do(self._request_key(path, request),
+                                           lambda: loop.run_in_executor(self._executor, run))
+
+
+def parse_request(content_type: str, query: dict[str, list[str]], body: bytes) -> dict:
+    """Normalize a JSON body or a raw PDF upload into one request dict"""
+    if content_type.startswith("application/pdf"):
+        request = {key: values[-1] for key, values in query.items()}
+        if "improvements" in query:
+            request["improvements"] = query["improvements"]
+        request["resume_pdf"] = body
+        return request
+    try:
+        request = json.loads(body or b"{}")
+    except json.JSONDecodeError as e:
+        raise HTTPError(400, f"Invalid JSON body: {e}")
+    if not isinstance(request, dict):
+        raise HTTPError(400, "JSON body must be an object")
+    for name in STRING_FIELDS:
+        if request.get(name) is not None and not isinstance(request[name], str):
+            raise HTTPError(400, f"{name} must be a string")
+    improvements = request.get("improvements")
+    if improvements is not None and not (isinstance(improvements, list)
+                                         and all(isinstance(item, str) for item in improvements)):
+        raise HTTPError(400, "improvements must be a list of strings")
+    if request.get("resume_pdf_base64"):
+        try:
+            request["resume_pdf"] = base64.b64decode(request.pop("resume_pdf_base64"), validate=True)
+        except (binascii.Error, ValueError):
+            raise HTTPError(400, "resume_pdf_base64 is not valid base64")
+    return request
+
+
+def _status_for(error: Exception) -> int:
+    if isinstance(error, HTTPError):
+        return error.status
+    # Bad model output and an unreachable backend are upstream failures, not the caller's
+    if isinstance(error, (StructuredOutputError, LLMError)) or isinstance(error.__context__, LLMError):
+        return 502
+    if isinstance(error, ValueError):
+        return 400
+    return 500
+
+
+async def _write_response(writer: asyncio.StreamWriter, status: int, body: bytes,
+                          content_type: str = "application/json", headers: Optional[dict] = None,
+                          keep_alive: bool = True) -> None:
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+             f"Content-Type: {content_type}",
+             f"Content-Length: {len(body)}",
+             f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[tuple[str, str, dict[str, str], bytes]]:
+    request_line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+    if not request_line:
+        return None
+    try:
+        method, target, _ = request_line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length header")
+    if length < 0:
+        raise HTTPError(400, "Invalid Content-Length header")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, f"Body larger than {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+def make_connection_handler(service: ReviewService) -> Callable:
+    async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    parsed = await _read_request(reader)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except HTTPError as e:
+                    await _write_response(writer, e.status, json.dumps({"error": str(e)}).encode(),
+                                          keep_alive=False)
+                    break
+                if parsed is None:
+                    break
+                method, target, headers, body = parsed
+                keep_alive = headers.get("connection", "").lower() != "close"
+                url = urlsplit(target)
+
+                if method == "GET" and url.path == "/healthz":
+                    payload = {"status": "ok", "coalesced": service.single_flight.coalesced,
+                               "backends": get_client().backend_status(),
+                               "llm_usage": get_client().usage_totals(),
+                               "structured_output": parse_metrics.snapshot()}
+                    await _write_response(writer, 200, json.dumps(payload).encode(), keep_alive=keep_alive)
+                elif method == "GET" and url.path == "/metrics":
+                    await _write_response(writer, 200, tracer.render_prometheus().encode(),
+                                          content_type="text/plain; version=0.0.4", keep_alive=keep_alive)
+                elif method != "POST":
+                    await _write_response(writer, 405, b'{"error": "Use POST"}', keep_alive=keep_alive)
+                else:
+                    try:
+                        request = parse_request(headers.get("content-type", ""), parse_qs(url.query), body)
+                        result, shared = await service.handle(url.path, request)
+                        await _write_response(writer, 200, json.dumps(result).encode(),
+                                              headers={"X-Coalesced": str(shared).lower()},
+                                              keep_alive=keep_alive)
+                    except Exception as e:
+                        await _write_response(writer, _status_for(e), json.dumps({"error": str(e)}).encode(),
+                                              keep_alive=keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    return handle_connection
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8600, service: Optional[ReviewService] = None,
+                ready: Optional[Callable[[asyncio.AbstractServer], None]] = None) -> None:
+    """Run the HTTP service until cancelled; `ready` is called with the listening server"""
+    server = await asyncio.start_server(make_connection_handler(service or ReviewService()), host, port,
+                                        limit=64 * 1024)
+    if ready:
+        ready(server)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve resume reviews over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS,
+                        help="Threads for parsing and LLM calls")
+    args = parser.parse_args(argv)
+
+    def ready(server: asyncio.AbstractServer) -> None:
+        addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"Review service listening on {addresses}", file=sys.stderr)
+
+    try:
+        asyncio.run(serve(args.host, args.port, ReviewService(args.workers), ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
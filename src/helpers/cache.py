@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Optional
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("RESUME_REVIEWER_CACHE_DIR", Path.home() / ".cache" / "resume-reviewer")
+)
+
+
+def normalize_text(text: str | None) -> str:
+    """Collapse whitespace so trivially different copies of a text hash the same"""
+    if not text:
+        return ""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def content_key(*parts: str | None) -> str:
+    """Build a stable sha256 key from the given parts"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update((part or "").encode("utf-8"))
+        digest.update(b"\x1f")  # unit separator, so ("ab", "c") != ("a", "bc")
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class LRUDiskCache:
+    """Two-tier cache: a bounded in-memory LRU in front of a JSON-file store on disk.
+
+    Values must be JSON serializable. Entries evicted from memory stay on disk,
+    so a restarted process warms back up from the disk tier. With persist=False
+    it is a plain thread-safe in-memory LRU and values can be any object.
+    """
+
+    def __init__(self, namespace: str, max_entries: int = 128,
+                 cache_dir: Optional[Path] = None, persist: bool = True):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.persist = persist
+        self.directory = Path(cache_dir or DEFAULT_CACHE_DIR) / namespace
+        self.stats = CacheStats()
+        self._memory: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, value: Any) -> None:
+        # Caller must hold the lock
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats.hits += 1
+                return self._memory[key]
+
+        value = self._read_disk(key)
+
+        with self._lock:
+            if value is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            self.stats.disk_hits += 1
+            self._remember(key, value)
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._remember(key, value)
+        self._write_disk(key, value)
+
+    def clear(self) -> None:
+        """Drop the in-memory tier (the disk tier is left untouched)"""
+        with self._lock:
+            self._memory.clear()
+
+    def _read_disk(self, key: str) -> Any | None:
+        if not self.persist:
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_disk(self, key: str, value: Any) -> None:
+        if not self.persist:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file first so readers never see a half-written entry
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk tier is best effort; the memory tier still works
+            pass
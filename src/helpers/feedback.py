@@ -9,4 +9,13 @@ class ResumeFeedback(BaseModel):
     improvements: List[str]
     highlighted_strengths: List[str] 
     highlighted_weaknesses: List[str] 
-    score: int
\ No newline at end of file
+    score: int
+
+class ImprovedResume(BaseModel):
+    improved_resume: str
+    changes_log: List[str]
+
+class ResumeComparison(BaseModel):
+    matched_skills: List[str]
+    missing_skills: List[str]
+    recommendations: List[str]
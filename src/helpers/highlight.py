@@ -1,36 +1,78 @@
-import fitz
 import io
 from typing import List, Union
 
-def highlight_resume_pdf_keywords(pdf_input: Union[str, io.BytesIO],
+from src.helpers.cache import LRUDiskCache, content_key
+from src.helpers.phrase_match import PhraseMatcher, normalize_token
+from src.helpers.tracing import traced
+from src.parsing.document import ParsedPage, ParsedResume, parse_resume
+
+# Highlighted PDFs kept in memory, keyed by the document hash and the phrase lists
+MAX_HIGHLIGHTED_DOCUMENTS = 16
+
+_highlighted = LRUDiskCache("highlighted", max_entries=MAX_HIGHLIGHTED_DOCUMENTS, persist=False)
+
+STRENGTH_COLOR = (0, 1, 0)  # green
+WEAKNESS_COLOR = (1, 0, 0)  # red
+
+def _page_highlight_rects(page: ParsedPage, matcher: PhraseMatcher) -> dict:
+    """Match every phrase against the page's words in one pass; returns {color: [rects]}"""
+    words = [w for w in page.words if normalize_token(w.text)]
+    tokens = [normalize_token(w.text) for w in words]
+
+    import fitz
+
+    rects = {}
+    seen = set()
+    for start, end, color in matcher.find(tokens):
+        # One rect per visual line the phrase covers, so multi-line phrases highlight cleanly
+        by_line = {}
+        for w in words[start:end]:
+            box = by_line.get(w.line)
+            by_line[w.line] = (w.x0, w.y0, w.x1, w.y1) if box is None else (
+                min(box[0], w.x0), min(box[1], w.y0), max(box[2], w.x1), max(box[3], w.y1))
+        for box in by_line.values():
+            if (color, box) not in seen:
+                seen.add((color, box))
+                rects.setdefault(color, []).append(fitz.Rect(box))
+    return rects
+
+@traced("highlight_pdf")
+def highlight_resume_pdf_keywords(pdf_input: Union[str, io.BytesIO, ParsedResume],
                                   strengths: List[str],
                                   weaknesses: List[str]) -> io.BytesIO:
-    # Open PDF
-    if isinstance(pdf_input, str):
-        doc = fitz.open(pdf_input)
-    else:
-        pdf_input.seek(0)
-        doc = fitz.open(stream=pdf_input.read(), filetype="pdf")
-    
-    # Highlight strengths
-    for page in doc:
-        for word in strengths:
-            for inst in page.search_for(word):
-                h = page.add_highlight_annot(inst)
-                h.set_colors(stroke=(0,1,0))  # green
-                h.update()
-    
-    # Highlight weaknesses
-    for page in doc:
-        for word in weaknesses:
-            for inst in page.search_for(word):
-                h = page.add_highlight_annot(inst)
-                h.set_colors(stroke=(1,0,0))  # red
-                h.update()
+    parsed = pdf_input if isinstance(pdf_input, ParsedResume) else parse_resume(pdf_input)
+
+    key = content_key(parsed.digest, "\x1e".join(strengths), "\x1e".join(weaknesses))
+    cached = _highlighted.get(key)
+    if cached is not None:
+        return io.BytesIO(cached)
+
+    matcher = PhraseMatcher(
+        [(phrase, STRENGTH_COLOR) for phrase in strengths] +
+        [(phrase, WEAKNESS_COLOR) for phrase in weaknesses]
+    )
+
+    import fitz
+
+    doc = fitz.open(stream=parsed.data, filetype="pdf")
+
+    for parsed_page in parsed.pages:
+        rects = _page_highlight_rects(parsed_page, matcher)
+        if not rects:
+            continue
+        page = doc[parsed_page.number]
+        # One annotation per colour per page instead of one per hit
+        for color, color_rects in rects.items():
+            h = page.add_highlight_annot(quads=color_rects)
+            h.set_colors(stroke=color)
+            h.update()
     
     # Save to in-memory bytes
     output = io.BytesIO()
     doc.save(output)
     doc.close()
+
+    _highlighted.put(key, output.getvalue())
+
     output.seek(0)
     return output
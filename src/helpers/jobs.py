@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from src.helpers.cache import content_key
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+@dataclass
+class Job:
+    id: str
+    name: str
+    status: str = STATUS_PENDING
+    result: Any = None
+    error: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (STATUS_DONE, STATUS_FAILED)
+
+
+def job_id_for(name: str, *args, **kwargs) -> str:
+    """Deterministic id: the same task with the same inputs always maps to the same job"""
+    return content_key(name, json.dumps([args, kwargs], sort_keys=True, default=str))
+
+
+class JobQueue:
+    """Runs work in background threads and keeps results by job id.
+
+    Submitting a job that is already queued, running or done returns the
+    existing id instead of running it again, so Streamlit reruns (or other
+    users asking for identical work) never duplicate a generation. Failed jobs
+    can be resubmitted. Only the most recent `max_jobs` finished jobs are kept.
+    """
+
+    def __init__(self, max_workers: int = 8, max_jobs: int = 256):
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, fn: Callable, *args, **kwargs) -> str:
+        job_id = job_id_for(name, *args, **kwargs)
+        with self._lock:
+            existing = self._jobs.get(job_id)
+            if existing is not None and existing.status != STATUS_FAILED:
+                self._jobs.move_to_end(job_id)
+                return job_id
+            job = Job(id=job_id, name=name)
+            self._jobs[job_id] = job
+            self._evict()
+            job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+        return job_id
+
+    def _run(self, job: Job, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        job.status = STATUS_RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = STATUS_DONE
+            return job.result
+        except Exception as e:
+            job.error = str(e)
+            job.status = STATUS_FAILED
+            raise
+        finally:
+            job.finished_at = time.time()
+
+    def _evict(self) -> None:
+        # Caller must hold the lock; unfinished jobs are never dropped
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(self._jobs) - self.max_jobs)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Any:
+        """Block until the job finishes and return its result (re-raising its exception)"""
+        job = self.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown job {job_id}")
+        return job.future.result(timeout=timeout)
+
+
+job_queue = JobQueue(max_workers=int(os.environ.get("RESUME_REVIEWER_TASK_WORKERS", "8")))
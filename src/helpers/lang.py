@@ -1,7 +1,41 @@
-from langdetect import detect
+import re
+from functools import lru_cache
 
+from src.helpers.tracing import span
+
+SAMPLE_SPANS = 3
+SPAN_CHARS = 500
+
+_NOISE = re.compile(r"\S+@\S+|https?://\S+|www\.\S+|[\d+()\-./|]{3,}")
+
+
+def sample_text(text: str, spans: int = SAMPLE_SPANS, span_chars: int = SPAN_CHARS) -> str:
+    """A few evenly spaced spans of the text, with emails, links and numbers removed.
+
+    Detection cost no longer grows with resume length, and the contact header
+    alone does not decide the language.
+    """
+    text = _NOISE.sub(" ", text)
+    if len(text) <= spans * span_chars:
+        return text
+    step = (len(text) - span_chars) // (spans - 1) if spans > 1 else 0
+    return "\n".join(text[i * step:i * step + span_chars] for i in range(spans))
+
+
+@lru_cache(maxsize=None)
+def _detector():
+    """Import langdetect on first use; it loads dozens of language profiles"""
+    from langdetect import DetectorFactory, detect
+
+    # langdetect is randomized; a fixed seed makes the same text always give the same answer
+    DetectorFactory.seed = 0
+    return detect
+
+
+@lru_cache(maxsize=256)
 def get_resume_language(resume_text):
     try:
-        return detect(resume_text)
+        with span("detect_language"):
+            return _detector()(sample_text(resume_text))
     except:
-        return "en"  # default to English
\ No newline at end of file
+        return "en"  # default to English
@@ -0,0 +1,72 @@
+import re
+from collections import deque
+from typing import Hashable, Iterable, List, Sequence, Tuple
+
+_EDGE_PUNCTUATION = re.compile(r"^\W+|\W+$")
+
+
+def normalize_token(token: str) -> str:
+    """Lowercase and strip leading/trailing punctuation, so 'Python,' matches 'python'"""
+    return _EDGE_PUNCTUATION.sub("", token.lower())
+
+
+def tokenize_phrase(phrase: str) -> List[str]:
+    return [t for t in (normalize_token(w) for w in phrase.split()) if t]
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over word tokens.
+
+    All phrases are matched in a single left-to-right pass over a token
+    sequence, regardless of how many phrases there are. Because it works on
+    tokens rather than raw text, a phrase matches across line breaks.
+    """
+
+    def __init__(self, phrases: Iterable[Tuple[str, Hashable]]):
+        # Node 0 is the root; each node has goto edges, a failure link and outputs
+        self._goto: List[dict] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[list] = [[]]
+        for phrase, label in phrases:
+            self._add(tokenize_phrase(phrase), label)
+        self._build_failure_links()
+
+    def _add(self, tokens: List[str], label: Hashable) -> None:
+        if not tokens:
+            return
+        node = 0
+        for token in tokens:
+            nxt = self._goto[node].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(tokens), label))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child].extend(self._out[self._fail[child]])
+
+    def find(self, tokens: Sequence[str]) -> List[Tuple[int, int, Hashable]]:
+        """Return (start, end_exclusive, label) for every phrase occurrence in the normalized tokens"""
+        matches = []
+        node = 0
+        for i, token in enumerate(tokens):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            for length, label in self._out[node]:
+                matches.append((i + 1 - length, i + 1, label))
+        return matches
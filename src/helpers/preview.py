@@ -0,0 +1,57 @@
+import hashlib
+import os
+from dataclasses import dataclass
+
+from src.helpers.cache import LRUDiskCache
+from src.helpers.tracing import traced
+
+# Resolution of page previews; 110 DPI is readable at the app's column width
+PREVIEW_DPI = int(os.environ.get("RESUME_REVIEWER_PREVIEW_DPI", "110"))
+# Rendered page images kept in memory, keyed by (document hash, page, dpi)
+MAX_PREVIEW_PAGES = 64
+MAX_PREVIEW_DOCUMENTS = 16
+
+
+@dataclass(frozen=True)
+class PreviewDocument:
+    digest: str
+    data: bytes
+    page_count: int
+
+
+_documents = LRUDiskCache("preview_documents", max_entries=MAX_PREVIEW_DOCUMENTS, persist=False)
+_pages = LRUDiskCache("preview_pages", max_entries=MAX_PREVIEW_PAGES, persist=False)
+
+
+def preview_document(data: bytes) -> PreviewDocument:
+    """Hash a PDF and count its pages once; later calls with the same bytes reuse the result"""
+    digest = hashlib.sha256(data).hexdigest()
+    cached = _documents.get(digest)
+    if cached is not None:
+        return cached
+
+    import fitz
+
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        document = PreviewDocument(digest=digest, data=data, page_count=doc.page_count)
+
+    _documents.put(digest, document)
+    return document
+
+
+@traced("render_preview")
+def render_page_png(document: PreviewDocument, page: int, dpi: int = PREVIEW_DPI) -> bytes:
+    """PNG of one page (0-based), rendered on first request only"""
+    key = f"{document.digest}:{page}:{dpi}"
+    cached = _pages.get(key)
+    if cached is not None:
+        return cached
+
+    import fitz
+
+    # Only the requested page is rasterized, so long documents cost nothing until paged through
+    with fitz.open(stream=document.data, filetype="pdf") as doc:
+        png = doc[page].get_pixmap(dpi=dpi).tobytes("png")
+
+    _pages.put(key, png)
+    return png
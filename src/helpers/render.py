@@ -0,0 +1,139 @@
+import io
+import re
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from src.helpers.cache import LRUDiskCache, content_key
+from src.helpers.tracing import traced
+
+# Rendered PDFs kept in memory, keyed by a hash of the text
+MAX_RENDERED_DOCUMENTS = 16
+MARGIN = 50
+
+_rendered = LRUDiskCache("rendered", max_entries=MAX_RENDERED_DOCUMENTS, persist=False)
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+_BULLET = re.compile(r"^[-*+•]\s+(.*)$")
+_NUMBERED = re.compile(r"^(\d+)[.)]\s+(.*)$")
+_RULE = re.compile(r"^([-*_])(\s*\1){2,}$")
+# Longest first, so "***" is one bold-italic marker rather than "**" followed by "*"
+_EMPHASIS = re.compile(r"\*\*\*|___|\*\*|__|\*")
+_TAGS = {"***": ("<b><i>", "</i></b>"), "___": ("<b><i>", "</i></b>"),
+         "**": ("<b>", "</b>"), "__": ("<b>", "</b>"), "*": ("<i>", "</i>")}
+
+
+# Built once on first render and shared by every later one; reportlab is only imported then
+@lru_cache(maxsize=None)
+def _styles() -> dict:
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+
+    base = getSampleStyleSheet()
+    body = ParagraphStyle("ResumeBody", parent=base["BodyText"], fontName="Helvetica",
+                          fontSize=10, leading=13, spaceAfter=2)
+    return {
+        "h1": ParagraphStyle("ResumeH1", parent=base["Heading1"], fontSize=16, leading=20, spaceAfter=6),
+        "h2": ParagraphStyle("ResumeH2", parent=base["Heading2"], fontSize=13, leading=16,
+                             spaceBefore=8, spaceAfter=4),
+        "h3": ParagraphStyle("ResumeH3", parent=base["Heading3"], fontSize=11, leading=14,
+                             spaceBefore=6, spaceAfter=2),
+        "body": body,
+        "bullet": ParagraphStyle("ResumeBullet", parent=body, leftIndent=14, bulletIndent=4),
+    }
+
+
+def _inline_markup(text: str) -> str:
+    """Escape reportlab's markup characters, then map ***bold italic***, **bold** and *italic* to tags.
+
+    Markers are matched with a stack, so a closing marker only closes the
+    innermost open one; anything unmatched or crossing (`**a *b** c*`) stays
+    literal text. The emitted tags are therefore always balanced.
+    """
+    text = escape(text)
+    parts: list[str] = []
+    stack: list[tuple[str, int]] = []  # (marker, index of its placeholder in parts)
+    pos = 0
+    for m in _EMPHASIS.finditer(text):
+        marker = m.group()
+        parts.append(text[pos:m.start()])
+        pos = m.end()
+        before = text[m.start() - 1] if m.start() else " "
+        after = text[m.end()] if m.end() < len(text) else " "
+        # Like markdown: no emphasis around spaces, and a single * inside a word (2*3*4) is literal
+        can_close = not before.isspace() and (marker != "*" or not after.isalnum())
+        can_open = not after.isspace() and (marker != "*" or not before.isalnum())
+        if stack and stack[-1][0] == marker and can_close:
+            _, index = stack.pop()
+            parts[index] = _TAGS[marker][0]
+            parts.append(_TAGS[marker][1])
+        elif can_open and all(open_marker != marker for open_marker, _ in stack):
+            stack.append((marker, len(parts)))
+            parts.append(marker)
+        else:
+            parts.append(marker)
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def _paragraph(text: str, style, **kwargs):
+    """A Paragraph with inline markup, or the escaped plain line if reportlab rejects the markup"""
+    from reportlab.platypus import Paragraph
+
+    try:
+        return Paragraph(_inline_markup(text), style, **kwargs)
+    except ValueError:
+        return Paragraph(escape(text), style, **kwargs)
+
+
+def markdown_flowables(text: str) -> list:
+    """One flowable per line: headings, bullets, numbered items, rules and plain paragraphs.
+
+    Each line is handled once, so layout cost grows linearly with the text.
+    """
+    from reportlab.platypus import HRFlowable, Spacer
+
+    styles = _styles()
+    flowables = []
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            flowables.append(Spacer(1, 6))
+            continue
+        if _RULE.match(line):
+            flowables.append(HRFlowable(width="100%", thickness=0.5, spaceBefore=4, spaceAfter=4))
+            continue
+        heading = _HEADING.match(line)
+        if heading:
+            level = min(len(heading.group(1)), 3)
+            flowables.append(_paragraph(heading.group(2), styles[f"h{level}"]))
+            continue
+        bullet = _BULLET.match(line)
+        if bullet:
+            flowables.append(_paragraph(bullet.group(1), styles["bullet"], bulletText="•"))
+            continue
+        numbered = _NUMBERED.match(line)
+        if numbered:
+            flowables.append(_paragraph(numbered.group(2), styles["bullet"], bulletText=f"{numbered.group(1)}."))
+            continue
+        flowables.append(_paragraph(line, styles["body"]))
+    return flowables
+
+
+@traced("render_pdf")
+def render_markdown_to_pdf_bytes(text: str) -> io.BytesIO:
+    """Render improved resume text (light markdown) into a wrapped, multi-page PDF."""
+    key = content_key(text)
+    cached = _rendered.get(key)
+    if cached is not None:
+        return io.BytesIO(cached)
+
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Spacer
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, leftMargin=MARGIN, rightMargin=MARGIN,
+                            topMargin=MARGIN, bottomMargin=MARGIN, title="Improved Resume")
+    doc.build(markdown_flowables(text) or [Spacer(1, 1)])
+    data = buffer.getvalue()
+
+    _rendered.put(key, data)
+    return io.BytesIO(data)
@@ -0,0 +1,252 @@
+import atexit
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# Off by default; when off, span() returns a shared no-op context and traced() calls straight through
+TRACING_ENABLED = os.environ.get("RESUME_REVIEWER_TRACING", "0") == "1"
+# When set, a background thread rewrites histograms here every METRICS_FILE_INTERVAL seconds
+METRICS_FILE = os.environ.get("RESUME_REVIEWER_METRICS_FILE")
+METRICS_FILE_INTERVAL = 5.0
+# A /metrics endpoint is served on this port when set (see start_metrics_server)
+METRICS_PORT = int(os.environ.get("RESUME_REVIEWER_METRICS_PORT", "0"))
+
+METRIC_NAME = "resume_reviewer_stage_seconds"
+COUNTER_PREFIX = "resume_reviewer_"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_NULL_SPAN = nullcontext()
+
+logger = logging.getLogger(__name__)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus layout"""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation (coarse, but enough to spot a slow stage)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+class Tracer:
+    """Collects stage durations into one histogram per (stage, labels), plus monotonic counters.
+
+    Counters (token counts, structured-output failures) are cheap and always
+    kept, so /metrics reports them even when stage tracing is off.
+    """
+
+    def __init__(self, enabled: bool = TRACING_ENABLED, metrics_file: Optional[str] = METRICS_FILE):
+        self.enabled = enabled
+        self.metrics_file = metrics_file
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple, Histogram] = {}
+        self._counters: dict[tuple, float] = {}
+        self._dirty = False
+        self._writer: Optional[threading.Thread] = None
+
+    def observe(self, stage: str, seconds: float, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = (stage, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+            self._changed()
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """Add to the counter exported as resume_reviewer_<name>_total"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._changed()
+
+    def _changed(self) -> None:
+        # Caller holds the lock. The file is written by a background thread, never on the request path
+        self._dirty = True
+        if self.enabled and self.metrics_file and self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, daemon=True, name="metrics-file")
+            self._writer.start()
+            atexit.register(self._flush)
+
+    def _flush(self) -> None:
+        with self._lock:
+            dirty, self._dirty = self._dirty, False
+        if dirty:
+            self.write(self.metrics_file)
+
+    def _write_loop(self) -> None:
+        while True:
+            time.sleep(METRICS_FILE_INTERVAL)
+            self._flush()
+
+    @contextmanager
+    def _span(self, stage: str, labels: dict) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **labels)
+
+    def span(self, stage: str, **labels: str):
+        """Time a `with` block under `stage`"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(stage, labels)
+
+    def snapshot(self) -> list[dict]:
+        """One row per histogram, for the debug panel"""
+        with self._lock:
+            items = sorted(self._histograms.items())
+            return [{
+                "stage": stage,
+                **dict(labels),
+                "count": h.count,
+                "total_s": round(h.sum, 3),
+                "mean_s": round(h.sum / h.count, 4) if h.count else 0.0,
+                "p50_s": h.quantile(0.5),
+                "p95_s": h.quantile(0.95),
+            } for (stage, labels), h in items]
+
+    def counters(self, name: Optional[str] = None) -> list[dict]:
+        """One row per counter (optionally only `name`), for the debug panel and /healthz"""
+        with self._lock:
+            return [{"metric": metric, **dict(labels), "value": value}
+                    for (metric, labels), value in sorted(self._counters.items())
+                    if name is None or metric == name]
+
+    def render_prometheus(self) -> str:
+        """All histograms and counters in the Prometheus text exposition format"""
+        lines = [f"# HELP {METRIC_NAME} Time spent in each review stage.", f"# TYPE {METRIC_NAME} histogram"]
+        with self._lock:
+            for (stage, labels), h in sorted(self._histograms.items()):
+                label_str = ",".join(f'{k}="{v}"' for k, v in (("stage", stage),) + labels)
+                cumulative = 0
+                for bound, n in zip(h.buckets + (float("inf"),), h.counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{METRIC_NAME}_bucket{{{label_str},le="{le}"}} {cumulative}')
+                lines.append(f"{METRIC_NAME}_sum{{{label_str}}} {h.sum:.6f}")
+                lines.append(f"{METRIC_NAME}_count{{{label_str}}} {h.count}")
+            typed = set()
+            for (metric, labels), value in sorted(self._counters.items()):
+                full_name = f"{COUNTER_PREFIX}{metric}_total"
+                if full_name not in typed:
+                    typed.add(full_name)
+                    lines.append(f"# TYPE {full_name} counter")
+                label_str = ",".join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f"{full_name}{{{label_str}}} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> bool:
+        """Write the exposition text atomically, e.g. for node_exporter's textfile collector.
+
+        Failures are logged, not raised: metrics must never break a review.
+        """
+        target = Path(path)
+        # Unique per process and thread, so concurrent writers never share a temp file
+        tmp = target.with_suffix(f"{target.suffix}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(self.render_prometheus(), encoding="utf-8")
+            os.replace(tmp, target)
+            return True
+        except OSError as e:
+            logger.warning("Could not write metrics file %s: %s", target, e)
+            try:
+                tmp.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+tracer = Tracer()
+
+
+def span(stage: str, **labels: str):
+    return tracer.span(stage, **labels)
+
+
+def traced(stage: str) -> Callable:
+    """Decorator form of span(); costs one attribute check per call while tracing is off"""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            with tracer._span(stage, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+_server: Optional["ThreadingHTTPServer"] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int = METRICS_PORT, host: str = "127.0.0.1") -> Optional["ThreadingHTTPServer"]:
+    """Serve GET /metrics on a daemon thread; only one server per process, no-op when port is 0"""
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+            class MetricsHandler(BaseHTTPRequestHandler):
+                def log_message(self, *args):
+                    pass
+
+                def do_GET(self):
+                    if self.path.split("?")[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = tracer.render_prometheus().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+            _server = ThreadingHTTPServer((host, port), MetricsHandler)
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server
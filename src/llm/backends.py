@@ -0,0 +1,162 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+import httpx
+import ollama
+
+logger = logging.getLogger(__name__)
+
+# Consecutive failures before a backend is taken out of rotation
+EJECT_AFTER_FAILURES = 2
+# First ejection lasts this long; repeated ejections double it up to MAX_EJECT_SECONDS
+EJECT_SECONDS = 15.0
+MAX_EJECT_SECONDS = 300.0
+HEALTH_CHECK_INTERVAL = 5.0
+HEALTH_CHECK_TIMEOUT = 2.0
+
+
+def parse_hosts(spec: str, default_concurrency: int) -> list[tuple[str, int]]:
+    """'http://a:11434,http://b:11434=6' -> [(host, concurrency cap), ...]"""
+    hosts = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        host, _, cap = entry.partition("=")
+        if "://" not in host:
+            host = f"http://{host}"
+        hosts.append((host.rstrip("/"), int(cap) if cap else default_concurrency))
+    return hosts
+
+
+class Backend:
+    """One Ollama endpoint with its own connection pool, concurrency cap and health state"""
+
+    def __init__(self, host: str, max_concurrency: int, timeout: float, connect_timeout: float, pool_size: int):
+        self.host = host
+        self.max_concurrency = max_concurrency
+        self.outstanding = 0
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.last_used = 0.0
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self.client = ollama.Client(
+            host=host,
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            # Transport-level retries only cover failed connects; generation errors are retried by LLMClient
+            transport=httpx.HTTPTransport(retries=1, limits=limits),
+        )
+
+    def is_ejected(self, now: float) -> bool:
+        return self.ejected_until > now
+
+    def status(self) -> dict:
+        now = time.monotonic()
+        return {
+            "host": self.host,
+            "outstanding": self.outstanding,
+            "max_concurrency": self.max_concurrency,
+            "healthy": not self.is_ejected(now),
+            "failures": self.failures,
+            "ejections": self.ejections,
+        }
+
+
+class BackendPool:
+    """Spreads requests over several Ollama backends.
+
+    Each request goes to the admitted backend with the fewest outstanding
+    requests that is under its concurrency cap; callers wait when every
+    backend is full. A backend that fails EJECT_AFTER_FAILURES times in a
+    row is ejected; a background health check re-admits it as soon as its
+    root endpoint answers again, otherwise it is tried again when the
+    ejection period (doubling on each repeat) runs out. If every backend is ejected, the one due
+    back soonest is still tried, so a full outage fails fast instead of hanging.
+    """
+
+    def __init__(self, backends: list[Backend]):
+        if not backends:
+            raise ValueError("BackendPool needs at least one backend")
+        self.backends = backends
+        self._cond = threading.Condition()
+        self._health_thread: Optional[threading.Thread] = None
+
+    def _pick(self, now: float) -> Optional[Backend]:
+        with_capacity = [b for b in self.backends if b.outstanding < b.max_concurrency]
+        admitted = [b for b in with_capacity if not b.is_ejected(now)]
+        if admitted:
+            # Least outstanding first; the least recently used breaks ties so idle backends share the load
+            return min(admitted, key=lambda b: (b.outstanding, b.last_used))
+        if all(b.is_ejected(now) for b in self.backends) and with_capacity:
+            return min(with_capacity, key=lambda b: b.ejected_until)
+        return None
+
+    def acquire(self) -> Backend:
+        with self._cond:
+            while True:
+                backend = self._pick(time.monotonic())
+                if backend is not None:
+                    backend.outstanding += 1
+                    backend.last_used = time.monotonic()
+                    return backend
+                # Woken by release() or a re-admission; the timeout re-checks ejection expiry
+                self._cond.wait(timeout=1.0)
+
+    def release(self, backend: Backend, ok: Optional[bool]) -> None:
+        """Return a slot. ok=False counts a backend failure, None (e.g. a 4xx) leaves health unchanged"""
+        with self._cond:
+            backend.outstanding -= 1
+            if ok:
+                backend.failures = 0
+                backend.ejections = 0
+            elif ok is False:
+                backend.failures += 1
+                if backend.failures >= EJECT_AFTER_FAILURES and not backend.is_ejected(time.monotonic()):
+                    self._eject(backend)
+            self._cond.notify_all()
+
+    def _eject(self, backend: Backend) -> None:
+        # Caller holds the condition lock
+        backend.ejections += 1
+        duration = min(EJECT_SECONDS * 2 ** (backend.ejections - 1), MAX_EJECT_SECONDS)
+        backend.ejected_until = time.monotonic() + duration
+        logger.warning("Ejecting Ollama backend %s for %.0fs after %d failures",
+                       backend.host, duration, backend.failures)
+        if self._health_thread is None or not self._health_thread.is_alive():
+            self._health_thread = threading.Thread(target=self._health_loop, daemon=True,
+                                                   name="ollama-health")
+            self._health_thread.start()
+
+    def _health_loop(self) -> None:
+        """Probe ejected backends until all are back in rotation"""
+        while True:
+            time.sleep(HEALTH_CHECK_INTERVAL)
+            with self._cond:
+                ejected = [b for b in self.backends if b.is_ejected(time.monotonic())]
+            if not ejected:
+                return
+            for backend in ejected:
+                try:
+                    healthy = httpx.get(backend.host, timeout=HEALTH_CHECK_TIMEOUT).status_code == 200
+                except httpx.HTTPError:
+                    healthy = False
+                if healthy:
+                    with self._cond:
+                        backend.ejected_until = 0.0
+                        backend.failures = 0
+                        self._cond.notify_all()
+                    logger.info("Re-admitted Ollama backend %s", backend.host)
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        """Transport errors and 5xx are transient; a 4xx means the request itself is wrong (unknown model, bad options)"""
+        if isinstance(error, ollama.ResponseError):
+            return error.status_code >= 500 or error.status_code == -1
+        return isinstance(error, (ConnectionError, httpx.TransportError))
+
+    def status(self) -> list[dict]:
+        with self._cond:
+            return [b.status() for b in self.backends]
@@ -0,0 +1,204 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+from src.helpers.tracing import tracer
+
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+# Comma-separated backend pool, each optionally with its own cap: "http://a:11434,http://b:11434=6"
+OLLAMA_HOSTS = os.environ.get("OLLAMA_HOSTS", OLLAMA_HOST)
+DEFAULT_MODEL = os.environ.get("RESUME_REVIEWER_MODEL", "mistral")
+EMBED_MODEL = os.environ.get("RESUME_REVIEWER_EMBED_MODEL", "nomic-embed-text")
+# Semantic scoring is skipped entirely when this is off (e.g. no embedding model pulled)
+SEMANTIC_ENABLED = os.environ.get("RESUME_REVIEWER_SEMANTIC", "1") == "1"
+# How long Ollama keeps the model loaded after a request, so it is not reloaded between reviews
+KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+REQUEST_TIMEOUT = float(os.environ.get("OLLAMA_TIMEOUT", "300"))
+CONNECT_TIMEOUT = float(os.environ.get("OLLAMA_CONNECT_TIMEOUT", "5"))
+MAX_RETRIES = int(os.environ.get("OLLAMA_MAX_RETRIES", "2"))
+POOL_SIZE = int(os.environ.get("OLLAMA_POOL_SIZE", "8"))
+# Requests allowed in flight at once per backend; extra callers wait for a slot
+MAX_CONCURRENCY = int(os.environ.get("OLLAMA_MAX_CONCURRENCY", "3"))
+
+
+logger = logging.getLogger(__name__)
+
+
+class LLMError(RuntimeError):
+    """Raised when the LLM backend cannot produce a completion"""
+
+
+@dataclass
+class LLMUsage:
+    task: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    seconds: float
+
+
+class LLMClient:
+    """Thin wrapper around the Ollama HTTP API.
+
+    Requests are spread over one or more backends (see BackendPool), each
+    with its own keep-alive connection pool and at most `max_concurrency`
+    requests in flight; the model is pinned in memory with `keep_alive`.
+    Transient failures are retried, usually on a different backend.
+    """
+
+    def __init__(self, host: Optional[str] = None, keep_alive: str | float = KEEP_ALIVE,
+                 timeout: float = REQUEST_TIMEOUT, connect_timeout: float = CONNECT_TIMEOUT,
+                 max_retries: int = MAX_RETRIES, pool_size: int = POOL_SIZE,
+                 max_concurrency: int = MAX_CONCURRENCY):
+        self.keep_alive = keep_alive
+        self.max_retries = max_retries
+        # Token counts reported by Ollama for the most recent calls
+        self.usage: deque[LLMUsage] = deque(maxlen=1000)
+        # backends pulls in httpx and ollama, so it is loaded when the first client is built, not at import
+        from src.llm.backends import Backend, BackendPool, parse_hosts
+
+        self.pool = BackendPool([
+            Backend(backend_host, cap, timeout, connect_timeout, pool_size)
+            for backend_host, cap in parse_hosts(host or OLLAMA_HOSTS, max_concurrency)
+        ])
+        self.hosts = [backend.host for backend in self.pool.backends]
+
+    def _request(self, method: str, **kwargs):
+        """Run one API call on the least busy backend, retrying transient failures with backoff"""
+        delay = 0.5
+        for attempt in range(self.max_retries + 1):
+            backend = self.pool.acquire()
+            ok = None
+            try:
+                result = getattr(backend.client, method)(**kwargs)
+                ok = True
+                return result
+            except Exception as e:
+                retryable = self.pool.is_retryable(e)
+                # Only transport and 5xx errors count against the backend's health
+                ok = False if retryable else None
+                if attempt >= self.max_retries or not retryable:
+                    raise LLMError(f"Ollama request to {backend.host} failed: {e}") from e
+            finally:
+                self.pool.release(backend, ok)
+            time.sleep(delay)
+            delay *= 2
+
+    def backend_status(self) -> list[dict]:
+        return self.pool.status()
+
+    def _record_usage(self, task: str, model: str, response, started: float) -> None:
+        usage = LLMUsage(
+            task=task,
+            model=model,
+            prompt_tokens=response.prompt_eval_count or 0,
+            completion_tokens=response.eval_count or 0,
+            seconds=time.perf_counter() - started,
+        )
+        self.usage.append(usage)
+        tracer.observe("llm_generation", usage.seconds, task=task, model=model)
+        tracer.increment("llm_calls", task=task, model=model)
+        tracer.increment("llm_prompt_tokens", usage.prompt_tokens, task=task, model=model)
+        tracer.increment("llm_completion_tokens", usage.completion_tokens, task=task, model=model)
+        logger.info("llm task=%s model=%s prompt_tokens=%d completion_tokens=%d seconds=%.2f",
+                    usage.task, usage.model, usage.prompt_tokens, usage.completion_tokens, usage.seconds)
+
+    def usage_totals(self) -> dict[str, dict[str, int]]:
+        """Prompt/completion token totals and call counts per task over the recorded calls"""
+        totals: dict[str, dict[str, int]] = {}
+        for u in list(self.usage):
+            t = totals.setdefault(u.task, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0})
+            t["calls"] += 1
+            t["prompt_tokens"] += u.prompt_tokens
+            t["completion_tokens"] += u.completion_tokens
+        return totals
+
+    def generate(self, prompt: str, model: Optional[str] = None,
+                 options: Optional[dict[str, Any]] = None, task: str = "generic",
+                 format: Optional[dict[str, Any] | str] = None) -> str:
+        """Run a single non-streaming completion and return the raw text.
+
+        `format` is passed to Ollama's structured outputs: "json" or a JSON
+        schema that constrains decoding, so the text always parses.
+        """
+        model = model or DEFAULT_MODEL
+        started = time.perf_counter()
+        response = self._request(
+            "generate",
+            model=model,
+            prompt=prompt,
+            options=options,
+            format=format,
+            keep_alive=self.keep_alive,
+        )
+        self._record_usage(task, model, response, started)
+        return response.response
+
+    def embed(self, texts: list[str], model: Optional[str] = None) -> list[list[float]]:
+        """Embed a batch of texts in one request; inputs longer than the model context are truncated"""
+        response = self._request(
+            "embed",
+            model=model or EMBED_MODEL,
+            input=texts,
+            truncate=True,
+            keep_alive=self.keep_alive,
+        )
+        return [list(v) for v in response.embeddings]
+
+    def stream(self, prompt: str, model: Optional[str] = None,
+               options: Optional[dict[str, Any]] = None, task: str = "generic",
+               format: Optional[dict[str, Any] | str] = None) -> Iterator[str]:
+        """Run a streaming completion, yielding text chunks as Ollama produces them.
+
+        Failures are only retried before the first chunk arrives, since the
+        caller has already consumed any partial output.
+        """
+        model = model or DEFAULT_MODEL
+        began = time.perf_counter()
+        delay = 0.5
+        for attempt in range(self.max_retries + 1):
+            # The backend is held for the whole stream, so its outstanding count stays accurate
+            backend = self.pool.acquire()
+            started = False
+            ok = None
+            try:
+                for chunk in backend.client.generate(model=model, prompt=prompt,
+                                                     options=options, format=format,
+                                                     keep_alive=self.keep_alive, stream=True):
+                    if chunk.response:
+                        if not started:
+                            tracer.observe("llm_first_token", time.perf_counter() - began,
+                                           task=task, model=model)
+                        started = True
+                        yield chunk.response
+                    if chunk.done:
+                        # Only the final chunk carries the token counts
+                        self._record_usage(task, model, chunk, began)
+                ok = True
+                return
+            except Exception as e:
+                retryable = self.pool.is_retryable(e)
+                ok = False if retryable else None
+                if started or attempt >= self.max_retries or not retryable:
+                    raise LLMError(f"Ollama stream from {backend.host} failed: {e}") from e
+            finally:
+                self.pool.release(backend, ok)
+            time.sleep(delay)
+            delay *= 2
+
+_client: Optional[LLMClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> LLMClient:
+    """Return the process-wide LLM client, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient()
+    return _client
@@ -0,0 +1,191 @@
+import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from src.helpers.cache import DEFAULT_CACHE_DIR, content_key, normalize_text
+from src.llm.client import EMBED_MODEL, get_client
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Exclusive advisory lock shared by every process using the same index directory"""
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class VectorIndex:
+    """Append-only, memory-mapped matrix of unit-length float32 vectors keyed by text hash.
+
+    Rows live in `vectors.f32` and the key for row i is line i of `keys.txt`,
+    so the index survives restarts and only rows that are touched get paged in.
+
+    Several processes (the app and the HTTP service) can share one directory:
+    appends take a file lock and first pick up rows other processes added, so
+    row numbers never collide. Windows has no fcntl, so there only one process
+    should write to a given cache directory.
+    """
+
+    def __init__(self, directory: Path, initial_capacity: int = 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.directory / "vectors.f32"
+        self._keys_path = self.directory / "keys.txt"
+        self._meta_path = self.directory / "meta.json"
+        self._lock_path = self.directory / "index.lock"
+        self._initial_capacity = initial_capacity
+        self._lock = threading.Lock()
+        self._rows: dict[str, int] = {}
+        self._keys: List[str] = []
+        # Bytes of keys.txt already loaded, so a refresh only reads what other processes appended
+        self._keys_offset = 0
+        self._matrix: Optional[np.memmap] = None
+        self.dim: Optional[int] = None
+        with self._lock:
+            self._refresh()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _open(self, capacity: int) -> None:
+        # Assigned in one step, so a reader holding the old mapping keeps a valid (shorter) view
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def _refresh(self) -> None:
+        """Load keys (and remap vectors) appended since the last look, by this or another process.
+
+        Caller holds self._lock.
+        """
+        if self.dim is None:
+            if not self._meta_path.exists():
+                return
+            self.dim = json.loads(self._meta_path.read_text())["dim"]
+        if not (self._keys_path.exists() and self._vectors_path.exists()) \
+                or self._keys_path.stat().st_size == self._keys_offset:
+            return
+        capacity = self._vectors_path.stat().st_size // (4 * self.dim)
+        if self._matrix is None or capacity > self._matrix.shape[0]:
+            self._open(capacity)
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            appended = f.read()
+        # Keys are written last and line by line, so only a complete line names a finished row
+        complete = appended[:appended.rfind(b"\n") + 1]
+        self._keys_offset += len(complete)
+        for key in complete.decode("utf-8").split():
+            self._rows[key] = len(self._keys)
+            self._keys.append(key)
+
+    def _ensure_capacity(self, rows: int) -> None:
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, capacity * 2, self._initial_capacity)
+        if self._matrix is not None:
+            self._matrix.flush()
+        with open(self._vectors_path, "ab") as f:
+            if f.tell() < new_capacity * self.dim * 4:
+                f.truncate(new_capacity * self.dim * 4)
+        self._open(new_capacity)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                # Another process may have embedded it since we last looked
+                self._refresh()
+                row = self._rows.get(key)
+            if row is None:
+                return None
+            return np.array(self._matrix[row])
+
+    def add(self, key: str, vector: Sequence[float]) -> None:
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            vec = vec / norm
+        with self._lock, _file_lock(self._lock_path):
+            self._refresh()
+            if key in self._rows:
+                return
+            if self.dim is None:
+                self.dim = int(vec.shape[0])
+                self._meta_path.write_text(json.dumps({"dim": self.dim}))
+            elif vec.shape[0] != self.dim:
+                raise ValueError(f"Vector has {vec.shape[0]} dimensions, index expects {self.dim}")
+            row = len(self._keys)
+            self._ensure_capacity(row + 1)
+            self._matrix[row] = vec
+            self._matrix.flush()
+            # The key is written last, so a crash never leaves a key pointing at an empty row
+            line = (key + "\n").encode("utf-8")
+            with open(self._keys_path, "ab") as f:
+                f.write(line)
+            self._keys_offset += len(line)
+            self._rows[key] = row
+            self._keys.append(key)
+
+    def search(self, query: Sequence[float], k: int = 10) -> List[tuple[str, float]]:
+        """Cosine top-k over every stored vector"""
+        with self._lock:
+            n = len(self._keys)
+            matrix, keys = self._matrix, self._keys
+        if n == 0:
+            return []
+        q = np.asarray(query, dtype=np.float32)
+        q = q / (np.linalg.norm(q) or 1.0)
+        # Rows below n never change and keys only grow, so the snapshot stays valid outside the lock
+        scores = np.asarray(matrix[:n]) @ q
+        k = min(k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(keys[int(i)], float(scores[i])) for i in top]
+
+
+_indexes: dict[str, VectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(model: str = EMBED_MODEL) -> VectorIndex:
+    """One index per embedding model, since vectors from different models are not comparable"""
+    with _indexes_lock:
+        if model not in _indexes:
+            safe_name = model.replace("/", "_").replace(":", "_")
+            _indexes[model] = VectorIndex(DEFAULT_CACHE_DIR / "embeddings" / safe_name)
+        return _indexes[model]
+
+
+def text_key(text: str) -> str:
+    return content_key(normalize_text(text))
+
+
+def embed_texts(texts: Sequence[str], model: str = EMBED_MODEL) -> np.ndarray:
+    """Unit vectors for the texts, embedding only those not already in the index"""
+    index = get_index(model)
+    keys = [text_key(t) for t in texts]
+    missing = {key: text for key, text in zip(keys, texts) if index.get(key) is None}
+    if missing:
+        vectors = get_client().embed(list(missing.values()), model=model)
+        for key, vector in zip(missing, vectors):
+            index.add(key, vector)
+    return np.vstack([index.get(key) for key in keys])
+
+
+def semantic_match(resume_text: str, job_description: str, model: str = EMBED_MODEL) -> int:
+    """Cosine similarity between resume and job description embeddings, as a 0-100 score"""
+    resume_vec, jd_vec = embed_texts([resume_text, job_description], model=model)
+    return int(max(0.0, float(resume_vec @ jd_vec)) * 100)
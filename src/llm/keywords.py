@@ -0,0 +1,88 @@
+import re
+from functools import lru_cache
+from typing import Iterable, List
+
+# One stopword list for both keyword extraction and keyword matching
+STOPWORDS = frozenset({
+    "a", "an", "the", "and", "or", "but", "of", "to", "in", "on", "at", "by", "as", "for",
+    "with", "from", "into", "about", "over", "this", "that", "these", "those", "it", "its",
+    "we", "you", "our", "your", "they", "their", "he", "she", "his", "her", "i", "me", "my",
+    "be", "is", "are", "was", "were", "been", "being", "am", "will", "would", "should", "must",
+    "can", "could", "may", "might", "have", "has", "had", "do", "does", "did", "not", "no",
+    "all", "any", "some", "such", "other", "more", "most", "also", "than", "then", "very",
+    "who", "what", "which", "when", "where", "how", "why", "etc", "per",
+    "role", "job", "position", "description", "candidate", "team", "work", "working",
+    "experience", "years", "year", "strong", "ability", "skills", "knowledge", "including",
+})
+
+# Single-letter tokens are noise ("e.g", "user's") except for these language names
+SINGLE_LETTER_SKILLS = frozenset({"c", "r"})
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def stem(token: str) -> str:
+    """Very light suffix stripping, so 'pipelines' matches 'pipeline' and 'deployed' matches 'deploy'"""
+    if len(token) <= 4 or token.isdigit():
+        return token
+    for suffix, replacement in (("ies", "y"), ("ing", ""), ("ed", ""), ("es", ""), ("s", "")):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            if suffix == "es" and not token.endswith(("ses", "xes", "zes", "ches", "shes")):
+                # 'roles' -> 'role', not 'rol'
+                return token[:-1]
+            if suffix == "s" and token.endswith("ss"):
+                return token
+            return token[: -len(suffix)] + replacement
+    return token
+
+
+def tokenize(text: str, use_stemming: bool = False) -> List[str]:
+    """Lowercase content tokens in order of appearance, without stopwords or single characters (except C and R)"""
+    tokens = [t for t in _TOKEN.findall(text.lower())
+              if (len(t) > 1 or t in SINGLE_LETTER_SKILLS) and t not in STOPWORDS]
+    if use_stemming:
+        tokens = [stem(t) for t in tokens]
+    return tokens
+
+
+@lru_cache(maxsize=1024)
+def _token_set(text: str, use_stemming: bool) -> frozenset:
+    return frozenset(tokenize(text, use_stemming))
+
+
+class KeywordIndex:
+    """Tokenizes with a shared vocabulary and caches each text's token set.
+
+    Scoring one resume against many job descriptions tokenizes the resume
+    once; repeated job descriptions are also served from the cache.
+    """
+
+    def __init__(self, use_stemming: bool = False):
+        self.use_stemming = use_stemming
+
+    def token_set(self, text: str) -> frozenset:
+        return _token_set(text or "", self.use_stemming)
+
+    def keywords(self, text: str, max_keywords: int = 15) -> List[str]:
+        if not text:
+            return []
+        return list(dict.fromkeys(tokenize(text, self.use_stemming)))[:max_keywords]
+
+    def match(self, resume_text: str, job_description: str) -> int:
+        """Percentage of the job description's keywords that appear in the resume"""
+        jd_tokens = self.token_set(job_description)
+        if not jd_tokens:
+            return 0
+        overlap = self.token_set(resume_text) & jd_tokens
+        return int((len(overlap) / len(jd_tokens)) * 100)
+
+    def match_many(self, resume_text: str, job_descriptions: Iterable[str]) -> List[int]:
+        resume_tokens = self.token_set(resume_text)
+        scores = []
+        for jd in job_descriptions:
+            jd_tokens = self.token_set(jd)
+            scores.append(int(len(resume_tokens & jd_tokens) / len(jd_tokens) * 100) if jd_tokens else 0)
+        return scores
+
+
+keyword_index = KeywordIndex()
@@ -0,0 +1,43 @@
+from typing import Iterable
+
+from src.helpers.jobs import job_queue
+from src.llm.prompts import TASK_COMPARISON, TASK_FEEDBACK, TASK_IMPROVED_RESUME
+from src.llm.reviewer import get_resume_feedback, request_improved_resume, request_resume_comparison
+
+ALL_TASKS = (TASK_FEEDBACK, TASK_IMPROVED_RESUME, TASK_COMPARISON)
+
+
+def start_review_tasks(resume_text: str, job_role: str, job_description: str | None = None,
+                       tasks: Iterable[str] = ALL_TASKS) -> dict[str, str]:
+    """Queue the requested LLM tasks to run concurrently and return their job ids by task name.
+
+    Identical requests map to the same job, so calling this again while the
+    jobs are running (or after they finished) does not start new generations.
+    The rewrite is started alongside the feedback rather than after it, so it
+    fixes weaknesses on its own instead of applying the feedback's improvement list.
+    The comparison is skipped when there is no job description to compare against.
+    """
+    job_ids = {}
+    tasks = set(tasks)
+    if TASK_FEEDBACK in tasks:
+        job_ids[TASK_FEEDBACK] = job_queue.submit(
+            TASK_FEEDBACK, get_resume_feedback, resume_text, job_role, job_description)
+    if TASK_IMPROVED_RESUME in tasks:
+        job_ids[TASK_IMPROVED_RESUME] = job_queue.submit(
+            TASK_IMPROVED_RESUME, request_improved_resume, resume_text, job_role)
+    if TASK_COMPARISON in tasks and job_description and job_description.strip():
+        job_ids[TASK_COMPARISON] = job_queue.submit(
+            TASK_COMPARISON, request_resume_comparison, resume_text, job_role=job_role, job_desc=job_description)
+    return job_ids
+
+
+def run_full_review(resume_text: str, job_role: str, job_description: str | None = None) -> dict:
+    """Run every review task concurrently and wait for all of them; failed tasks map to their exception"""
+    job_ids = start_review_tasks(resume_text, job_role, job_description)
+    results = {}
+    for name, job_id in job_ids.items():
+        try:
+            results[name] = job_queue.wait(job_id)
+        except Exception as e:
+            results[name] = e
+    return results
@@ -0,0 +1,154 @@
+import os
+import re
+from collections import Counter
+from typing import Iterable
+
+from src.llm.keywords import tokenize
+
+TASK_FEEDBACK = "feedback"
+TASK_SECTION = "section"
+TASK_IMPROVED_RESUME = "improved_resume"
+TASK_COMPARISON = "comparison"
+
+# Prompt token budgets per task. Prefill time on CPU-only hosts grows with prompt length,
+# so each task only gets what it needs; override with RESUME_REVIEWER_BUDGET_<TASK>.
+TASK_BUDGETS = {
+    task: int(os.environ.get(f"RESUME_REVIEWER_BUDGET_{task.upper()}", default))
+    for task, default in (
+        (TASK_FEEDBACK, 1800),
+        (TASK_SECTION, 700),
+        # The rewrite always gets the full resume; this only bounds its instructions
+        (TASK_IMPROVED_RESUME, 1800),
+        (TASK_COMPARISON, 1500),
+    )
+}
+# Share of the space left after instructions that a job description may take
+JD_SHARE = 0.35
+
+RESUME_SLOT = "<<RESUME>>"
+JD_SLOT = "<<JOB_DESCRIPTION>>"
+
+_PIECE = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?;])\s+|\n+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough BPE-style count: about one token per 4 characters of a word, one per symbol"""
+    return sum((len(p) + 3) // 4 if p[0].isalnum() or p[0] == "_" else 1 for p in _PIECE.findall(text))
+
+
+def compact(text: str, dedupe: bool = True) -> str:
+    """Strip indentation, collapse runs of spaces and blank lines, and drop repeated lines.
+
+    Only templates and job descriptions are deduplicated: a resume legitimately
+    repeats lines (the same title or bullet under two employers), so it is
+    compacted with dedupe=False.
+    """
+    lines = []
+    seen = set()
+    blank = False
+    for line in text.splitlines():
+        line = re.sub(r"[ \t]+", " ", line).strip()
+        if not line:
+            blank = bool(lines)
+            continue
+        key = line.lower()
+        if dedupe and key in seen and line not in (RESUME_SLOT, JD_SLOT):
+            continue
+        seen.add(key)
+        if blank:
+            lines.append("")
+            blank = False
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Keep whole lines (then whole words) from the start of the text until the budget is used"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    kept = []
+    used = 0
+    for line in text.splitlines():
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            words = []
+            for word in line.split():
+                used += estimate_tokens(word)
+                if used > max_tokens:
+                    break
+                words.append(word)
+            if words:
+                kept.append(" ".join(words))
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept) + "\n..."
+
+
+def fit_job_description(job_description: str, max_tokens: int, focus: Iterable[str] = ()) -> str:
+    """Shrink a job description to the budget, keeping its most requirement-heavy sentences.
+
+    Sentences are ranked by how many of the description's most frequent
+    keywords (plus any `focus` terms such as the job role) they mention, so
+    boilerplate like benefits or EEO statements is dropped first. The kept
+    sentences stay in their original order.
+    """
+    text = compact(job_description)
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    sentences = [s.strip() for s in _SENTENCE_SPLIT.split(text) if s.strip()]
+    frequent = {t for t, _ in Counter(tokenize(text)).most_common(30)}
+    frequent.update(tokenize(" ".join(focus)))
+
+    ranked = sorted(range(len(sentences)),
+                    key=lambda i: -len(frequent.intersection(tokenize(sentences[i]))))
+    chosen = set()
+    used = 0
+    for i in ranked:
+        cost = estimate_tokens(sentences[i]) + 1
+        if used + cost > max_tokens:
+            continue
+        chosen.add(i)
+        used += cost
+    return "\n".join(sentences[i] for i in sorted(chosen))
+
+
+def _fill_budget(task: str, template: str, job_description: str | None,
+                 focus: Iterable[str]) -> tuple[str, str, int]:
+    """Compacted template, fitted job description and the tokens left over for the resume"""
+    template = compact(template)
+    budget = TASK_BUDGETS[task]
+    overhead = estimate_tokens(template.replace(RESUME_SLOT, "").replace(JD_SLOT, ""))
+    remaining = max(budget - overhead, 0)
+
+    jd_text = ""
+    if JD_SLOT in template:
+        jd_text = fit_job_description(job_description, int(remaining * JD_SHARE), focus) \
+            if job_description and job_description.strip() else "Not provided"
+        remaining -= estimate_tokens(jd_text)
+    return template, jd_text, max(remaining, 0)
+
+
+def resume_fits(task: str, template: str, resume_text: str, job_description: str | None = None,
+                focus: Iterable[str] = ()) -> bool:
+    """Whether assemble_prompt would pass the resume through without truncating it"""
+    _, _, remaining = _fill_budget(task, template, job_description, focus)
+    return estimate_tokens(compact(resume_text, dedupe=False)) <= remaining
+
+
+def assemble_prompt(task: str, template: str, resume_text: str = "",
+                    job_description: str | None = None, focus: Iterable[str] = (),
+                    truncate_resume: bool = True) -> str:
+    """Fill RESUME_SLOT and JD_SLOT in a template so the whole prompt fits the task's token budget.
+
+    The template is compacted first; the job description gets at most
+    JD_SHARE of the remaining budget and the resume gets the rest. Tasks that
+    must see the whole resume (the rewrite) pass truncate_resume=False.
+    """
+    template, jd_text, remaining = _fill_budget(task, template, job_description, focus)
+    resume_part = compact(resume_text, dedupe=False)
+    if truncate_resume:
+        resume_part = truncate_to_tokens(resume_part, remaining)
+    return template.replace(JD_SLOT, jd_text).replace(RESUME_SLOT, resume_part)
@@ -1,66 +1,67 @@
-import json
-import re
-from langchain.llms import Ollama
-from src.helpers.feedback import ResumeFeedback
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator
+from src.helpers.feedback import ImprovedResume, ResumeComparison, ResumeFeedback
 from pydantic import ValidationError
 from src.helpers.lang import get_resume_language
+from src.helpers.cache import LRUDiskCache, content_key, normalize_text
+from src.helpers.tracing import span, traced
+from src.llm.client import EMBED_MODEL, SEMANTIC_ENABLED, get_client
+from src.llm.stream_json import IncrementalJSONParser
+from src.llm.sections import HEADER_SECTION, Section, split_sections
+from src.llm.keywords import keyword_index
+from src.llm.prompts import (JD_SLOT, RESUME_SLOT, TASK_COMPARISON, TASK_FEEDBACK, TASK_IMPROVED_RESUME,
+                             TASK_SECTION, assemble_prompt, resume_fits)
+from src.llm.router import router
+from src.llm.structured import StructuredOutputError, generate_structured, parse_json_object
 
-llm = Ollama(model="mistral")
+# Bump whenever build_prompt or the scoring changes so stale cached feedback is not reused
+PROMPT_VERSION = "7"
+# Resumes longer than this (or too long for the feedback token budget) are analyzed section by section
+SINGLE_PASS_CHAR_LIMIT = int(os.environ.get("RESUME_REVIEWER_SINGLE_PASS_CHARS", "4000"))
+SECTION_CHAR_LIMIT = int(os.environ.get("RESUME_REVIEWER_SECTION_CHARS", "1500"))
+
+# Section prompts wait on HTTP; the LLM client's concurrency cap bounds the actual backend load
+_section_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="section")
+
+feedback_cache = LRUDiskCache("feedback", max_entries=128)
+# Per-section analyses, so an edited resume only re-runs the sections that changed
+section_cache = LRUDiskCache("sections", max_entries=1024)
 
 def extract_keywords(text: str, max_keywords: int = 15) -> list:
     """Extract relevant keywords from text"""
-    if not text:
-        return []
-    
-    words = re.findall(r"[a-zA-Z]+", text)
-    stopwords = {"the", "and", "with", "for", "this", "that", "from", 
-                "your", "role", "job", "position", "description", "should",
-                "will", "must", "have", "has", "are", "is", "was", "were"}
-    keywords = [w.lower() for w in words if len(w) > 3 and w.lower() not in stopwords]
-    return list(dict.fromkeys(keywords))[:max_keywords]
+    return keyword_index.keywords(text, max_keywords)
 
 def compute_keyword_match(resume_text: str, job_description: str) -> int:
     """Calculate keyword match percentage"""
     if not job_description:
         return 0
-        
-    resume_words = set(re.findall(r'\w+', resume_text.lower()))
-    jd_words = set(re.findall(r'\w+', job_description.lower()))
-    
-    # Remove common words
-    common_words = {'the', 'and', 'with', 'for', 'this', 'that', 'from', 
-                   'your', 'role', 'job', 'position', 'description'}
-    jd_words = jd_words - common_words
-    
-    if not jd_words:
-        return 0
-        
-    overlap = resume_words.intersection(jd_words)
-    return int((len(overlap) / len(jd_words)) * 100)
+    return keyword_index.match(resume_text, job_description)
 
-def build_prompt(resume_text: str, job_role: str, job_description: str | None = None) -> str:
-    """Build the prompt for the LLM"""
+def feedback_template(resume_text: str, job_role: str, job_description: str | None = None) -> str:
+    """The single-pass feedback prompt with the resume and job description still as slots"""
     jd_keywords = extract_keywords(job_description or job_role)
     keyword_str = ", ".join(jd_keywords[:10])
     
-    # Truncate resume text to avoid token limits
-    truncated_resume = resume_text[:2000] + "..." if len(resume_text) > 2000 else resume_text
+    language = get_resume_language(resume_text)
     
-    prompt = f"""
+    # The resume and job description are filled in by assemble_prompt, trimmed to the task's token budget
+    template = f"""
     ROLE: You are an expert career coach with 20+ years of hiring experience.
 
     TASK: Analyze this resume for the target job role: "{job_role}".
     Important keywords to focus on: {keyword_str}
 
     RESUME TEXT:
-    {truncated_resume}
+    {RESUME_SLOT}
 
     JOB DESCRIPTION:
-    {job_description or "Not provided"}
+    {JD_SLOT}
 
     REQUIREMENTS:
     1. Provide ONLY valid JSON output with no additional text
-    2. Use these exact keys: summary, missing_skills, weaknesses, strengths, improvements, score
+    2. Use these exact keys: summary, missing_skills, weaknesses, strengths, improvements,
+       highlighted_strengths, highlighted_weaknesses, score
     3. Score must be an integer between 0-100
     4. All other values must be arrays of strings except summary which is a string
 
@@ -91,87 +92,196 @@ def build_prompt(resume_text: str, job_role: str, job_description: str | None =
     - Provide atleast 3 strengths that are exact word-for-word phrases from the resume text.
     - Provide weaknesses without fail
 
+    **IMPORTANT:** Respond back in {language} language for ALL json fields.
+    """
+    return template
 
-    IMPORTANT: Your entire response must be valid JSON only. Do not add any explanatory text.
+@traced("build_prompt")
+def build_prompt(resume_text: str, job_role: str, job_description: str | None = None) -> str:
+    """Build the prompt for the LLM"""
+    template = feedback_template(resume_text, job_role, job_description)
+    return assemble_prompt(TASK_FEEDBACK, template, resume_text, job_description, focus=[job_role])
+
+def extract_json_from_text(text: str) -> dict:
+    """Parse the JSON object in an LLM reply; raises StructuredOutputError instead of guessing"""
+    return parse_json_object(text)
+
+def build_section_prompt(section: Section, job_role: str, keyword_str: str, language: str) -> str:
+    """Build a small prompt that analyzes a single resume section"""
+    template = f"""
+    ROLE: You are an expert career coach with 20+ years of hiring experience.
+
+    TASK: Analyze ONE section ("{section.title}") of a resume for the target job role: "{job_role}".
+    Important keywords to focus on: {keyword_str}
+
+    SECTION TEXT:
+    {RESUME_SLOT}
 
-    **IMPORTANT:** Respond back in {get_resume_language(resume_text)} language for ALL json fields.
-    **IMPORTANT:** Check if {get_resume_language(resume_text)} language is used for ALL json fields.
+    Return ONLY valid JSON with these keys:
+    {{
+      "summary": "one sentence on how this section supports the {job_role} application",
+      "missing_skills": ["skill needed for {job_role} that this section lacks"],
+      "weaknesses": ["specific weakness in this section"],
+      "strengths": ["specific strength in this section"],
+      "improvements": ["actionable suggestion for this section"],
+      "highlighted_strengths": ["exact phrase copied word-for-word from the section text"],
+      "highlighted_weaknesses": ["exact phrase copied word-for-word from the section text"],
+      "score": integer between 0 and 100 for how well this section fits {job_role}
+    }}
+
+    Highlighted phrases must be copied exactly from the section text; return [] if there are none.
+    Respond in {language} language for ALL json fields.
     """
-    return prompt
+    return assemble_prompt(TASK_SECTION, template, section.text)
 
-def extract_json_from_text(text: str) -> dict:
-    """Extract JSON from LLM output, handling various formats"""
-    # Clean the text
-    cleaned = text.strip()
-    
-    # Remove markdown code blocks
-    if cleaned.startswith("```json"):
-        cleaned = cleaned[7:]
-    elif cleaned.startswith("```"):
-        cleaned = cleaned[3:]
-    if cleaned.endswith("```"):
-        cleaned = cleaned[:-3]
-    
-    cleaned = cleaned.strip()
-    
-    # Try direct JSON parsing first
-    try:
-        return json.loads(cleaned)
-    except json.JSONDecodeError:
-        pass
-    
-    # Try to find JSON object pattern
-    json_pattern = r'\{[\s\S]*\}'
-    match = re.search(json_pattern, cleaned, re.DOTALL)
-    
-    if match:
+def _dedupe(items: list, limit: int) -> list:
+    seen = set()
+    result = []
+    for item in items:
+        if not isinstance(item, str) or not item.strip() or item.lower() in seen:
+            continue
+        seen.add(item.lower())
+        result.append(item)
+    return result[:limit]
+
+def merge_section_results(results: list[tuple[Section, dict]], resume_text: str) -> dict:
+    """Reduce per-section analyses into a single ResumeFeedback-shaped dict"""
+    weighted_score = total_weight = 0
+    merged = {key: [] for key in ("missing_skills", "weaknesses", "strengths", "improvements",
+                                  "highlighted_strengths", "highlighted_weaknesses")}
+    summaries = []
+
+    for section, result in results:
+        for key in merged:
+            value = result.get(key)
+            if isinstance(value, list):
+                merged[key].extend(value)
+        if isinstance(result.get("summary"), str) and section.title != HEADER_SECTION:
+            summaries.append(result["summary"].strip())
         try:
-            return json.loads(match.group())
-        except json.JSONDecodeError:
-            # Try to fix common JSON issues
-            fixed_json = match.group()
-            # Fix single quotes to double quotes
-            fixed_json = fixed_json.replace("'", '"')
-            # Fix trailing commas
-            fixed_json = re.sub(r',\s*}', '}', fixed_json)
-            fixed_json = re.sub(r',\s*]', ']', fixed_json)
-            
-            try:
-                return json.loads(fixed_json)
-            except json.JSONDecodeError:
-                pass
-    
-    # If all else fails, create a fallback response
-    return {
-        "summary": f"Analysis for {job_role} completed successfully. Review the detailed feedback below.",
-        "missing_skills": [],
-        "weaknesses": [],
-        "strengths": [],
-        "improvements": [],
-        "score": 50
-    }
-
-def get_resume_feedback(resume_text: str, job_role: str, job_description: str | None = None) -> ResumeFeedback:
-    """Get feedback on resume from LLM"""
+            score = max(0, min(100, int(result.get("score"))))
+        except (TypeError, ValueError):
+            continue
+        # Longer sections carry more of the resume, so they weigh more in the overall score
+        weighted_score += score * len(section.text)
+        total_weight += len(section.text)
+
+    # A section often "misses" a skill that another section covers
+    lowered_resume = resume_text.lower()
+    merged["missing_skills"] = [s for s in merged["missing_skills"]
+                                if isinstance(s, str) and s.lower() not in lowered_resume]
+
+    feedback = {key: _dedupe(values, 10) for key, values in merged.items()}
+    feedback["summary"] = " ".join(_dedupe(summaries, 4))
+    feedback["score"] = int(weighted_score / total_weight) if total_weight else 50
+    return feedback
+
+def section_cache_key(section: Section, job_role: str, keyword_str: str, language: str) -> str:
+    """Cache key for one section's analysis: everything that goes into its prompt"""
+    return content_key(
+        section.title,
+        normalize_text(section.text),
+        normalize_text(job_role),
+        keyword_str,
+        language,
+        router.route(TASK_SECTION).signature(),
+        PROMPT_VERSION,
+    )
+
+def analyze_resume_sections(resume_text: str, job_role: str, job_description: str | None = None,
+                            use_cache: bool = True) -> dict:
+    """Map-reduce analysis: analyze each section with its own small prompt in parallel, then merge.
+
+    Section results are cached by content, so when a resume is edited and
+    re-analyzed only the sections whose text changed go to the LLM; the
+    rest are reused and everything is merged again.
+    """
+    sections = split_sections(resume_text, max_chars=SECTION_CHAR_LIMIT)
+    keyword_str = ", ".join(extract_keywords(job_description or job_role)[:10])
+    language = get_resume_language(resume_text)
+
+    def analyze(section: Section, key: str) -> dict:
+        prompt = build_section_prompt(section, job_role, keyword_str, language)
+        result = router.generate(prompt, ResumeFeedback, TASK_SECTION, accept=_feedback_is_usable)
+        if use_cache:
+            section_cache.put(key, result)
+        return result
+
+    pending = []
+    for section in sections:
+        key = section_cache_key(section, job_role, keyword_str, language)
+        cached = section_cache.get(key) if use_cache else None
+        pending.append((section, cached if cached is not None else _section_executor.submit(analyze, section, key)))
+
+    results = []
+    errors = []
+    for section, outcome in pending:
+        try:
+            results.append((section, outcome if isinstance(outcome, dict) else outcome.result()))
+        except Exception as e:
+            # One failed section should not sink the whole review
+            errors.append(e)
+    if not results:
+        raise ValueError(f"LLM call failed: {errors[0] if errors else 'no resume sections found'}")
+    return merge_section_results(results, resume_text)
+
+def _use_sections(resume_text: str, job_role: str, job_description: str | None, incremental: bool) -> bool:
+    """Section by section when asked to, or when the single prompt could not hold the whole resume"""
+    if incremental or len(resume_text) > SINGLE_PASS_CHAR_LIMIT:
+        return True
+    template = feedback_template(resume_text, job_role, job_description)
+    return not resume_fits(TASK_FEEDBACK, template, resume_text, job_description, focus=[job_role])
+
+def feedback_cache_key(resume_text: str, job_role: str, job_description: str | None = None,
+                       sectioned: bool = False) -> str:
+    """Cache key for a review: normalized inputs, which path produced it, plus the model and prompt version"""
+    return content_key(
+        normalize_text(resume_text),
+        normalize_text(job_role),
+        normalize_text(job_description),
+        "sections" if sectioned else "single",
+        router.route(TASK_SECTION if sectioned else TASK_FEEDBACK).signature(),
+        EMBED_MODEL if SEMANTIC_ENABLED else "",
+        PROMPT_VERSION,
+    )
+
+def _cached_feedback(resume_text: str, job_role: str, job_description: str | None,
+                     sectioned: bool) -> tuple[str, dict | None]:
+    """This path's cache key, plus a cached review of the same inputs from either path.
+
+    A re-run of text that was already reviewed returns that review, even if
+    it now picks the other path, instead of generating a different answer.
+    """
+    cache_key = feedback_cache_key(resume_text, job_role, job_description, sectioned)
+    cached = feedback_cache.get(cache_key)
+    if cached is None:
+        cached = feedback_cache.get(feedback_cache_key(resume_text, job_role, job_description, not sectioned))
+    return cache_key, cached
+
+def _feedback_is_usable(data: dict) -> bool:
+    """Whether a first-pass answer is good enough to keep instead of escalating"""
+    return bool(data["summary"].strip()) and bool(data["strengths"] or data["weaknesses"]) \
+        and 0 <= data["score"] <= 100
+
+def _check_inputs(resume_text: str, job_role: str) -> None:
     if not resume_text.strip():
         raise ValueError("Resume text is empty")
     
     if not job_role.strip():
         raise ValueError("Job role is required")
-    
-    prompt = build_prompt(resume_text, job_role, job_description)
-    
-    try:
-        raw_output = llm(prompt)
-    except Exception as e:
-        raise ValueError(f"LLM call failed: {e}")
-    
-    # Extract JSON from the output
-    json_output = extract_json_from_text(raw_output)
-    
+
+def _finalize_feedback(json_output: dict, resume_text: str, job_role: str,
+                       job_description: str | None) -> tuple[ResumeFeedback, bool]:
+    """Validate parsed LLM output and apply hybrid scoring.
+
+    Also reports whether the result may be cached: validation passed and every
+    enabled score signal was applied, since the cache key assumes they were.
+    """
+    cacheable = True
     try:
         feedback = ResumeFeedback(**json_output)
     except ValidationError as e:
+        cacheable = False
         # Create fallback feedback if validation fails
         feedback = ResumeFeedback(
             summary=f"Analysis for {job_role} completed with minor formatting issues.",
@@ -179,6 +289,8 @@ def get_resume_feedback(resume_text: str, job_role: str, job_description: str |
             weaknesses=[],
             strengths=[],
             improvements=[],
+            highlighted_strengths=[],
+            highlighted_weaknesses=[],
             score=50
         )
 
@@ -190,12 +302,216 @@ def get_resume_feedback(resume_text: str, job_role: str, job_description: str |
 
     # Hybrid scoring adjustment if job description is provided
     if job_description and job_description.strip():
+        with span("hybrid_score"):
+            feedback.score, complete = _hybrid_score(feedback.score, resume_text, job_description)
+        cacheable = cacheable and complete
+
+    return feedback, cacheable
+
+def _hybrid_score(llm_score: int, resume_text: str, job_description: str) -> tuple[int, bool]:
+    """Blend the LLM score with keyword overlap and embedding similarity.
+
+    Also reports whether the embedding similarity was applied (or is switched off).
+    """
+    try:
+        keyword_score = compute_keyword_match(resume_text, job_description)
+    except Exception:
+        # If keyword scoring fails, keep the original score
+        keyword_score = None
+    semantic_score = None
+    semantic_applied = not SEMANTIC_ENABLED
+    if SEMANTIC_ENABLED:
+        # numpy and the vector index load only once a job description is actually scored
+        from src.llm.embeddings import semantic_match
         try:
-            keyword_score = compute_keyword_match(resume_text, job_description)
-            feedback.score = int((feedback.score * 0.7) + (keyword_score * 0.3))
-            feedback.score = max(0, min(100, feedback.score))
+            # Embeddings catch synonyms ("k8s" vs "Kubernetes") that keyword overlap misses
+            semantic_score = semantic_match(resume_text, job_description)
+            semantic_applied = True
         except Exception:
-            # If keyword scoring fails, keep the original score
             pass
 
-    return feedback
\ No newline at end of file
+    score = llm_score
+    if keyword_score is not None and semantic_score is not None:
+        score = int(llm_score * 0.6 + keyword_score * 0.2 + semantic_score * 0.2)
+    elif keyword_score is not None:
+        score = int((llm_score * 0.7) + (keyword_score * 0.3))
+    return max(0, min(100, score)), semantic_applied
+
+@traced("review")
+def get_resume_feedback(resume_text: str, job_role: str, job_description: str | None = None,
+                        use_cache: bool = True, incremental: bool = False) -> ResumeFeedback:
+    """Get feedback on resume from LLM.
+
+    With incremental=True even short resumes are analyzed section by section,
+    so re-running after a small edit only regenerates the edited sections.
+    """
+    _check_inputs(resume_text, job_role)
+
+    sectioned = _use_sections(resume_text, job_role, job_description, incremental)
+    cache_key = feedback_cache_key(resume_text, job_role, job_description, sectioned)
+    if use_cache:
+        cache_key, cached = _cached_feedback(resume_text, job_role, job_description, sectioned)
+        if cached is not None:
+            return ResumeFeedback(**cached)
+    
+    if sectioned:
+        json_output = analyze_resume_sections(resume_text, job_role, job_description, use_cache=use_cache)
+    else:
+        prompt = build_prompt(resume_text, job_role, job_description)
+        
+        try:
+            json_output = router.generate(prompt, ResumeFeedback, TASK_FEEDBACK, accept=_feedback_is_usable)
+        except StructuredOutputError:
+            raise
+        except Exception as e:
+            raise ValueError(f"LLM call failed: {e}")
+    feedback, cacheable = _finalize_feedback(json_output, resume_text, job_role, job_description)
+
+    # Only cache real answers, so a formatting hiccup or an embedding outage is retried on the next click
+    if use_cache and cacheable:
+        feedback_cache.put(cache_key, feedback.model_dump())
+
+    return feedback
+
+def stream_resume_feedback(resume_text: str, job_role: str, job_description: str | None = None,
+                           use_cache: bool = True, incremental: bool = False) -> Iterator[tuple[str, Any]]:
+    """Stream feedback from the LLM field by field.
+
+    Yields a (field, value) pair as soon as each ResumeFeedback field is complete
+    in the token stream, then a final ("feedback", ResumeFeedback) pair holding
+    the validated, hybrid-scored result (the same value get_resume_feedback returns).
+    """
+    _check_inputs(resume_text, job_role)
+
+    sectioned = _use_sections(resume_text, job_role, job_description, incremental)
+    cache_key = feedback_cache_key(resume_text, job_role, job_description, sectioned)
+    if use_cache:
+        cache_key, cached = _cached_feedback(resume_text, job_role, job_description, sectioned)
+        if cached is not None:
+            feedback = ResumeFeedback(**cached)
+            yield from cached.items()
+            yield "feedback", feedback
+            return
+
+    if sectioned:
+        # Section results only exist once every section is merged, so there is nothing to stream early
+        feedback = get_resume_feedback(resume_text, job_role, job_description, use_cache=use_cache,
+                                       incremental=incremental)
+        yield from feedback.model_dump().items()
+        yield "feedback", feedback
+        return
+
+    prompt = build_prompt(resume_text, job_role, job_description)
+    parser = IncrementalJSONParser()
+    chunks = []
+
+    # Streamed answers come straight from the main model; a first pass would show text that may be replaced
+    route = router.route(TASK_FEEDBACK)
+    try:
+        for chunk in get_client().stream(prompt, model=route.model, options=route.options(), task=TASK_FEEDBACK,
+                                         format=ResumeFeedback.model_json_schema()):
+            chunks.append(chunk)
+            for key, value in parser.feed(chunk):
+                if key in ResumeFeedback.model_fields:
+                    yield key, value
+    except Exception as e:
+        raise ValueError(f"LLM call failed: {e}")
+
+    # Validate the full reply; only an unusable one costs another (non-streamed) generation
+    try:
+        json_output = generate_structured(prompt, ResumeFeedback, model=route.model, task=TASK_FEEDBACK,
+                                          raw_output="".join(chunks), options=route.options())
+    except StructuredOutputError:
+        raise
+    except Exception as e:
+        raise ValueError(f"LLM call failed: {e}")
+    feedback, cacheable = _finalize_feedback(json_output, resume_text, job_role, job_description)
+
+    if use_cache and cacheable:
+        feedback_cache.put(cache_key, feedback.model_dump())
+
+    yield "feedback", feedback
+
+def call_local_mistral(prompt: str, model: str | None = None, task: str = "generic") -> str:
+    """Call the local Ollama model routed for the task (or `model`) and return raw text."""
+    route = router.route(task)
+    return get_client().generate(prompt, model=model or route.model, options=route.options(), task=task)
+
+def request_improved_resume(resume_text: str, job_role: str, improvements: list[str] | None = None) -> dict:
+    """Ask LLM to rewrite resume with improvements applied."""
+
+    # Detect language
+    resume_language = get_resume_language(resume_text)
+    language_instruction = (
+        f"**IMPORTANT:** All json fields MUST BE in {resume_language} language. "
+        "Both the improved_resume AND changes_log. Do not respond without ensuring this fact."
+    )
+
+    # Build the prompt as a template; the resume is sent whole, since the rewrite must keep every section
+    template = f"""
+You are a professional resume editor.
+Take the following resume and improve it by:
+- Fixing weaknesses
+- Applying the listed improvements
+- Keeping all factual information intact
+- Making language stronger and more professional
+
+Job Role: {job_role}
+Resume Text:
+{RESUME_SLOT}
+
+{language_instruction}
+
+Return JSON in this format:
+{{
+  "improved_resume": "Improved resume text here",
+  "changes_log": ["list of changes made"]
+}}
+IMPORTANT: Respond with valid JSON ONLY. Do NOT include any text outside the JSON object. Escape quotes in resume text properly.
+"""
+
+    if improvements:
+        template += "\n\nImprovements to apply:\n- " + "\n- ".join(improvements)
+    prompt = assemble_prompt(TASK_IMPROVED_RESUME, template, resume_text, truncate_resume=False)
+
+    # A rewrite much shorter than the original usually means a small model dropped content
+    return router.generate(prompt, ImprovedResume, TASK_IMPROVED_RESUME,
+                           accept=lambda data: len(data["improved_resume"]) >= 0.5 * len(resume_text))
+
+def request_resume_comparison(resume_text: str, job_role: str, job_desc: str = "") -> dict:
+    """
+    Compare a resume against a job role or description.
+    Ensures output is in the same language as the resume.
+    If job_desc is empty, defaults to general expectations.
+    """
+    # Detect resume language (using your existing function)
+    resume_language = get_resume_language(resume_text)
+
+    if not job_desc.strip():
+        job_desc = f"Job description not provided. Analysis is based on general expectations for the role: {job_role}."
+
+    COMPARE_PROMPT_TEMPLATE = f"""
+    You are a professional resume reviewer. Keep the output in the same language as the resume: {resume_language}.
+    
+    Compare the following resume with the job role and/or description:
+
+    Job Role: {job_role}
+    Job Description:
+    {JD_SLOT}
+
+    Resume Text:
+    {RESUME_SLOT}
+
+    Provide a JSON output with keys:
+    {{
+        "matched_skills": ["skills that match or are relevant"],
+        "missing_skills": ["skills expected but missing"],
+        "recommendations": ["general improvements or tailoring suggestions"]
+    }}
+
+    IMPORTANT: Your entire response must be valid JSON only. Do not add any explanatory text.
+    """
+
+    prompt = assemble_prompt(TASK_COMPARISON, COMPARE_PROMPT_TEMPLATE, resume_text, job_desc, focus=[job_role])
+    return router.generate(prompt, ResumeComparison, TASK_COMPARISON,
+                           accept=lambda data: bool(data["matched_skills"] or data["missing_skills"]))
\ No newline at end of file
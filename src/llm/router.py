@@ -0,0 +1,103 @@
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional, Type
+
+from pydantic import BaseModel
+
+from src.llm.client import DEFAULT_MODEL, get_client
+from src.llm.prompts import TASK_COMPARISON, TASK_FEEDBACK, TASK_IMPROVED_RESUME, TASK_SECTION
+from src.llm.structured import StructuredOutputError, generate_structured
+
+logger = logging.getLogger(__name__)
+
+TASKS = (TASK_FEEDBACK, TASK_SECTION, TASK_IMPROVED_RESUME, TASK_COMPARISON)
+# One context size for every task: it fits the largest prompt budget plus its JSON answer, and
+# Ollama reloads a model whenever the requested size changes, so tasks sharing a model must agree
+DEFAULT_NUM_CTX = int(os.environ.get("RESUME_REVIEWER_NUM_CTX", "4096"))
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """Which model answers a task, with what context window, and an optional cheaper first try.
+
+    Every task defaults to the same num_ctx (DEFAULT_NUM_CTX), so tasks on
+    the same model share one loaded copy instead of forcing reloads.
+    """
+    model: str
+    num_ctx: Optional[int] = None
+    first_pass_model: Optional[str] = None
+
+    def options(self) -> Optional[dict]:
+        return {"num_ctx": self.num_ctx} if self.num_ctx else None
+
+    def signature(self) -> str:
+        """Identifies everything that can change the answer, for cache keys"""
+        return f"{self.first_pass_model or ''}>{self.model}@{self.num_ctx or ''}"
+
+
+def route_from_env(task: str) -> ModelRoute:
+    """RESUME_REVIEWER_MODEL_<TASK>, RESUME_REVIEWER_NUM_CTX_<TASK> and RESUME_REVIEWER_FIRST_PASS_<TASK>"""
+    suffix = task.upper()
+    num_ctx = os.environ.get(f"RESUME_REVIEWER_NUM_CTX_{suffix}")
+    return ModelRoute(
+        model=os.environ.get(f"RESUME_REVIEWER_MODEL_{suffix}", DEFAULT_MODEL),
+        num_ctx=int(num_ctx) if num_ctx else DEFAULT_NUM_CTX or None,
+        first_pass_model=os.environ.get(f"RESUME_REVIEWER_FIRST_PASS_{suffix}") or None,
+    )
+
+
+class ModelRouter:
+    """Maps each task to a model route and runs first-pass-then-escalate generations.
+
+    When a task has a first-pass model, it answers first; if its output does
+    not parse or fails the caller's `accept` check, the same prompt goes to
+    the task's main model. Escalations are counted per task.
+    """
+
+    def __init__(self, routes: Optional[dict[str, ModelRoute]] = None):
+        self.routes = routes or {task: route_from_env(task) for task in TASKS}
+        self._lock = threading.Lock()
+        self.escalations: dict[str, int] = {}
+
+    def route(self, task: str) -> ModelRoute:
+        return self.routes.get(task) or ModelRoute(model=DEFAULT_MODEL)
+
+    def generate(self, prompt: str, schema: Optional[Type[BaseModel]], task: str,
+                 accept: Optional[Callable[[dict], bool]] = None) -> dict:
+        route = self.route(task)
+        if route.first_pass_model:
+            try:
+                # No repair round on the cheap model: a bad answer goes straight to the main one
+                data = generate_structured(prompt, schema, model=route.first_pass_model, task=task,
+                                           max_repairs=0, options=route.options())
+                if accept is None or accept(data):
+                    return data
+                reason = "low-quality answer"
+            except StructuredOutputError as e:
+                reason = str(e)
+            with self._lock:
+                self.escalations[task] = self.escalations.get(task, 0) + 1
+            logger.info("Escalating %s from %s to %s: %s", task, route.first_pass_model, route.model, reason)
+        return generate_structured(prompt, schema, model=route.model, task=task, options=route.options())
+
+    def latency_report(self) -> list[dict]:
+        """Call count and latency per (task, model) over the client's recorded calls"""
+        groups: dict[tuple[str, str], list[float]] = {}
+        for usage in list(get_client().usage):
+            groups.setdefault((usage.task, usage.model), []).append(usage.seconds)
+        report = []
+        for (task, model), seconds in sorted(groups.items()):
+            seconds.sort()
+            report.append({
+                "task": task,
+                "model": model,
+                "calls": len(seconds),
+                "mean_s": round(sum(seconds) / len(seconds), 3),
+                "p95_s": round(seconds[min(len(seconds) - 1, int(0.95 * len(seconds)))], 3),
+            })
+        return report
+
+
+router = ModelRouter()
@@ -0,0 +1,102 @@
+import re
+from dataclasses import dataclass
+from typing import List
+
+# Lowercased heading words (English and Spanish) that start a new resume section
+SECTION_HEADINGS = {
+    "summary", "professional summary", "profile", "about me", "objective",
+    "experience", "work experience", "professional experience", "employment", "employment history",
+    "education", "academic background", "skills", "technical skills", "core competencies",
+    "projects", "certifications", "certificates", "awards", "achievements", "publications",
+    "languages", "volunteering", "volunteer experience", "interests",
+    "resumen", "perfil", "perfil profesional", "experiencia", "experiencia laboral",
+    "experiencia profesional", "educación", "educacion", "formación", "formacion",
+    "habilidades", "competencias", "proyectos", "certificaciones", "idiomas", "logros",
+}
+HEADER_SECTION = "header"
+
+
+@dataclass
+class Section:
+    title: str
+    text: str
+
+
+def _heading_title(line: str) -> str | None:
+    """Return the normalized heading if the line looks like a section heading"""
+    stripped = line.strip().strip(":").strip()
+    if not stripped or len(stripped) > 40:
+        return None
+    lowered = re.sub(r"[^\w\s&]", "", stripped.lower()).strip()
+    if lowered in SECTION_HEADINGS:
+        return lowered
+    # Short ALL CAPS lines are headings in most resume templates
+    if stripped.isupper() and len(stripped.split()) <= 4 and any(c.isalpha() for c in stripped):
+        return lowered
+    return None
+
+
+def _compact(text: str) -> str:
+    """Collapse runs of spaces and blank lines; they cost tokens and carry no meaning"""
+    text = re.sub(r"[ \t]+", " ", text)
+    return re.sub(r"\n\s*\n+", "\n", text).strip()
+
+
+def _split_long(section: Section, max_chars: int) -> List[Section]:
+    """Split an oversized section on line boundaries into chunks of at most max_chars"""
+    if len(section.text) <= max_chars:
+        return [section]
+    chunks, current, size = [], [], 0
+    for line in section.text.split("\n"):
+        if current and size + len(line) + 1 > max_chars:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return [Section(f"{section.title} (part {i + 1})", chunk) for i, chunk in enumerate(chunks)]
+
+
+def split_sections(resume_text: str, max_chars: int = 1500, min_chars: int = 200) -> List[Section]:
+    """Split resume text into headed sections, merging tiny ones and chunking oversized ones.
+
+    Text before the first recognised heading (name, contact details) is folded
+    into the first section when they fit together; it only stays a separate
+    "header" section when it is too long for that or the resume has no headings.
+    """
+    sections = [Section(HEADER_SECTION, "")]
+    lines = []
+    for line in resume_text.splitlines():
+        title = _heading_title(line)
+        if title:
+            sections[-1].text = _compact("\n".join(lines))
+            sections.append(Section(title, ""))
+            lines = []
+        else:
+            lines.append(line)
+    sections[-1].text = _compact("\n".join(lines))
+
+    header = sections[0].text if len(sections) > 1 else ""
+    if header:
+        sections = sections[1:]
+
+    merged: List[Section] = []
+    for section in sections:
+        if not section.text:
+            continue
+        # Contact details alone are not worth an LLM call; send them along with the first section
+        if header and len(header) + len(section.text) < max_chars:
+            section.text = f"{header}\n{section.title.upper()}\n{section.text}"
+        elif header:
+            merged.append(Section(HEADER_SECTION, header))
+        header = ""
+        # Fold short sections into the previous one so we don't spend a whole LLM call on two lines
+        if merged and len(section.text) < min_chars and len(merged[-1].text) + len(section.text) <= max_chars:
+            merged[-1].text += f"\n{section.title.upper()}\n{section.text}"
+            continue
+        merged.append(section)
+    if header:
+        merged.append(Section(HEADER_SECTION, header))
+
+    return [chunk for section in merged for chunk in _split_long(section, max_chars)]
@@ -0,0 +1,69 @@
+import json
+from typing import Any
+
+
+class IncrementalJSONParser:
+    """Parse a JSON object as it streams in, emitting each top-level field once it is complete.
+
+    Text before the opening brace (markdown fences, chatter) is ignored. Only
+    the first top-level object is parsed; anything after it is dropped.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = -1
+        self.done = False
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """Consume a chunk of text and return the (key, value) pairs completed by it"""
+        if self.done:
+            return []
+        self._buffer += chunk
+        completed = []
+        buf = self._buffer
+
+        while self._pos < len(buf):
+            ch = buf[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                if self._depth > 0:
+                    self._in_string = True
+            elif ch == "{" or (ch == "[" and self._depth > 0):
+                self._depth += 1
+                if self._depth == 1:
+                    self._member_start = self._pos + 1
+            elif ch in "}]" and self._depth > 0:
+                if self._depth == 1:
+                    completed.extend(self._close_member(self._pos))
+                    self.done = True
+                    self._depth = 0
+                    break
+                self._depth -= 1
+            elif ch == "," and self._depth == 1:
+                completed.extend(self._close_member(self._pos))
+                self._member_start = self._pos + 1
+            self._pos += 1
+
+        return completed
+
+    def _close_member(self, end: int) -> list[tuple[str, Any]]:
+        member = self._buffer[self._member_start:end].strip()
+        if not member:
+            return []
+        try:
+            parsed = json.loads("{" + member + "}")
+        except json.JSONDecodeError:
+            # Left to the strict parse of the full text once the stream ends
+            return []
+        return list(parsed.items())
+
@@ -0,0 +1,115 @@
+import json
+import logging
+import os
+from typing import Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+from src.helpers.tracing import span, tracer
+from src.llm.client import get_client
+
+# Extra generations allowed after the first one fails to parse or validate
+MAX_REPAIR_ATTEMPTS = int(os.environ.get("RESUME_REVIEWER_MAX_REPAIRS", "1"))
+
+logger = logging.getLogger(__name__)
+
+
+class StructuredOutputError(ValueError):
+    """Raised when the LLM output is not a JSON object matching the expected schema"""
+
+
+class ParseMetrics:
+    """Per-task counters for structured generations and how often their output failed to parse.
+
+    Kept as tracer counters, so they are exported with the stage histograms as
+    resume_reviewer_structured_output_total{task, event}.
+    """
+
+    FIELDS = ("calls", "parse_failures", "repairs", "repaired", "gave_up")
+    METRIC = "structured_output"
+
+    def incr(self, task: str, name: str) -> None:
+        tracer.increment(self.METRIC, task=task, event=name)
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        counts: dict[str, dict[str, int]] = {}
+        for row in tracer.counters(self.METRIC):
+            counts.setdefault(row["task"], dict.fromkeys(self.FIELDS, 0))[row["event"]] = int(row["value"])
+        return counts
+
+
+parse_metrics = ParseMetrics()
+
+
+def parse_json_object(text: str) -> dict:
+    """Strict single-pass parse of an LLM reply into a JSON object.
+
+    Surrounding markdown fences or chatter are skipped by parsing from the
+    first '{' to the last '}'; nothing inside the object is rewritten.
+    """
+    start = text.find("{")
+    end = text.rfind("}")
+    if start < 0 or end < start:
+        raise StructuredOutputError("No JSON object in LLM output")
+    try:
+        data = json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError(f"Invalid JSON in LLM output: {e}") from e
+    if not isinstance(data, dict):
+        raise StructuredOutputError("LLM output is not a JSON object")
+    return data
+
+
+def validate_output(text: str, schema: Optional[Type[BaseModel]] = None) -> dict:
+    """Parse the reply and, when a schema model is given, check it against that model"""
+    data = parse_json_object(text)
+    if schema is not None:
+        try:
+            data = schema(**data).model_dump()
+        except ValidationError as e:
+            raise StructuredOutputError(f"LLM output does not match {schema.__name__}: {e}") from e
+    return data
+
+
+def repair_prompt(prompt: str, error: Exception) -> str:
+    # Validation errors can list every field; the first lines are enough to steer the retry
+    reason = str(error)[:500]
+    return (f"{prompt}\n\nYour previous response could not be used ({reason}). "
+            "Respond again with ONLY the JSON object, following the schema exactly.")
+
+
+def generate_structured(prompt: str, schema: Optional[Type[BaseModel]] = None, model: Optional[str] = None,
+                        task: str = "generic", max_repairs: int = MAX_REPAIR_ATTEMPTS,
+                        raw_output: Optional[str] = None, options: Optional[dict] = None) -> dict:
+    """Generate with decoding constrained to the schema, then parse strictly.
+
+    Ollama's `format` keeps the model on the schema, so a failure is rare
+    (typically a reply cut off at the context limit). Each failure is
+    counted and retried at most `max_repairs` times with the error attached
+    to the prompt; after that StructuredOutputError is raised.
+
+    Pass `raw_output` when the first reply was already generated (e.g.
+    streamed); it is checked before any new generation is started.
+    """
+    fmt = schema.model_json_schema() if schema is not None else "json"
+    parse_metrics.incr(task, "calls")
+    current = prompt
+    for attempt in range(max_repairs + 1):
+        if attempt:
+            parse_metrics.incr(task, "repairs")
+        if attempt or raw_output is None:
+            raw_output = get_client().generate(current, model=model, options=options, task=task, format=fmt)
+        try:
+            with span("parse_json", task=task):
+                data = validate_output(raw_output, schema)
+        except StructuredOutputError as e:
+            parse_metrics.incr(task, "parse_failures")
+            logger.warning("Unparseable %s output (attempt %d/%d): %s", task, attempt + 1, max_repairs + 1, e)
+            current = repair_prompt(prompt, e)
+            error = e
+            continue
+        if attempt:
+            parse_metrics.incr(task, "repaired")
+        return data
+    parse_metrics.incr(task, "gave_up")
+    raise error
@@ -0,0 +1,59 @@
+from typing import List, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from src.llm.keywords import KeywordIndex, keyword_index
+
+
+def build_term_matrix(token_sets: Sequence[frozenset], vocabulary: dict[str, int]) -> sparse.csr_matrix:
+    """Binary document x term matrix; tokens outside the vocabulary are ignored"""
+    indptr = [0]
+    indices = []
+    for tokens in token_sets:
+        indices.extend(vocabulary[t] for t in tokens if t in vocabulary)
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float32)
+    return sparse.csr_matrix((data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+                             shape=(len(token_sets), len(vocabulary)))
+
+
+def score_matrix(resumes: Sequence[str], job_descriptions: Sequence[str],
+                 index: KeywordIndex = keyword_index) -> np.ndarray:
+    """Keyword match percentage for every (job description, resume) pair, shape (M, N).
+
+    Same measure as compute_keyword_match, computed for all pairs with one
+    sparse matrix product instead of M x N set intersections.
+    """
+    jd_tokens = [index.token_set(jd) for jd in job_descriptions]
+    # Only terms that occur in some job description can contribute to a score
+    vocabulary = {}
+    for tokens in jd_tokens:
+        for t in tokens:
+            vocabulary.setdefault(t, len(vocabulary))
+
+    jd_matrix = build_term_matrix(jd_tokens, vocabulary)
+    resume_matrix = build_term_matrix([index.token_set(r) for r in resumes], vocabulary)
+
+    overlap = (jd_matrix @ resume_matrix.T).toarray().astype(np.float64)
+    jd_sizes = np.asarray(jd_matrix.sum(axis=1)).ravel()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(jd_sizes[:, None] > 0, overlap * 100.0 / jd_sizes[:, None], 0.0)
+    return scores
+
+
+def top_k_candidates(resumes: Sequence[str], job_descriptions: Sequence[str],
+                     k: int = 10) -> List[List[tuple[int, float]]]:
+    """For each job description, the k best resumes as (resume index, score), best first"""
+    scores = score_matrix(resumes, job_descriptions)
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return [[] for _ in job_descriptions]
+
+    # argpartition finds the top k in linear time; only those k get sorted
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+    return [list(zip(row.tolist(), row_scores.round(2).tolist())) for row, row_scores in zip(top, top_scores)]
@@ -0,0 +1,224 @@
+import hashlib
+import io
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import BinaryIO, List, Optional, Union
+
+from src.helpers.cache import LRUDiskCache
+from src.helpers.tracing import span
+
+# Parsed documents kept in memory, keyed by the sha256 of the file bytes
+MAX_PARSED_DOCUMENTS = 32
+# Pages beyond this are ignored so a huge upload cannot pin a worker
+MAX_PAGES = int(os.environ.get("RESUME_REVIEWER_MAX_PAGES", "50"))
+# Documents with more pages than this are split across a process pool
+PARALLEL_PAGE_THRESHOLD = int(os.environ.get("RESUME_REVIEWER_PARALLEL_PAGES", "12"))
+PARSE_WORKERS = int(os.environ.get("RESUME_REVIEWER_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+ENGINE_PYMUPDF = "pymupdf"
+ENGINE_PDFPLUMBER = "pdfplumber"
+
+_ZERO_WIDTH = re.compile(r"[\u200b-\u200d\ufeff]")
+
+ResumeSource = Union[bytes, str, BinaryIO]
+
+
+@dataclass(frozen=True)
+class Word:
+    text: str
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+    line: int  # index of the visual line within the page
+
+
+@dataclass
+class ParsedPage:
+    number: int
+    width: float
+    height: float
+    text: str
+    words: List[Word] = field(default_factory=list)
+    engine: str = ENGINE_PYMUPDF
+    seconds: float = 0.0
+
+
+@dataclass
+class ParsedResume:
+    """Everything we need from a resume PDF, extracted in a single pass."""
+    digest: str
+    data: bytes
+    pages: List[ParsedPage]
+    page_count: int = 0  # pages in the file, including any beyond MAX_PAGES
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(page.text for page in self.pages if page.text).strip()
+
+    @property
+    def truncated(self) -> bool:
+        return self.page_count > len(self.pages)
+
+    def report(self) -> List[dict]:
+        """Per-page extraction engine and timing"""
+        return [{"page": p.number, "engine": p.engine, "seconds": round(p.seconds, 4)} for p in self.pages]
+
+
+def _read_bytes(source: ResumeSource) -> bytes:
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read()
+    source.seek(0)
+    data = source.read()
+    source.seek(0)
+    return data
+
+
+def _plumber_lines(raw_words: list[dict]) -> List[Word]:
+    """Assign line numbers: a word starts a new line when it does not vertically overlap the previous one"""
+    words = []
+    line = 0
+    prev_top = prev_bottom = None
+    for w in raw_words:
+        if prev_top is not None and (w["top"] >= prev_bottom or w["bottom"] <= prev_top):
+            line += 1
+        words.append(Word(w["text"], w["x0"], w["top"], w["x1"], w["bottom"], line))
+        prev_top, prev_bottom = w["top"], w["bottom"]
+    return words
+
+
+def _pymupdf_page(page) -> ParsedPage:
+    words = []
+    lines = []
+    line = -1
+    prev_key = None
+    for x0, y0, x1, y1, text, block_no, line_no, _ in page.get_text("words", sort=True):
+        text = _ZERO_WIDTH.sub("", text)
+        if not text:
+            continue
+        if (block_no, line_no) != prev_key:
+            prev_key = (block_no, line_no)
+            line += 1
+            lines.append([])
+        words.append(Word(text, x0, y0, x1, y1, line))
+        lines[-1].append(text)
+    return ParsedPage(
+        number=page.number,
+        width=float(page.rect.width),
+        height=float(page.rect.height),
+        # Built from the words so text and boxes always agree, one visual line per row like pdfplumber
+        text="\n".join(" ".join(ws) for ws in lines),
+        words=words,
+    )
+
+
+def _needs_fallback(page: ParsedPage) -> bool:
+    """Heuristic for text layers PyMuPDF decodes poorly (missing ToUnicode maps, lost spacing)"""
+    if not page.words:
+        return True
+    chars = sum(len(w.text) for w in page.words)
+    garbled = sum(1 for w in page.words for c in w.text if c == "\ufffd" or "\ue000" <= c <= "\uf8ff")
+    if garbled / chars > 0.02:
+        return True
+    return chars / len(page.words) > 20
+
+
+def _pdfplumber_page(pdf, number: int) -> ParsedPage:
+    page = pdf.pages[number]
+    return ParsedPage(
+        number=number,
+        width=float(page.width),
+        height=float(page.height),
+        text=page.extract_text() or "",
+        words=_plumber_lines(page.extract_words()),
+        engine=ENGINE_PDFPLUMBER,
+    )
+
+
+def _parse_page_range(data: bytes, start: int, stop: int) -> List[ParsedPage]:
+    """Parse pages [start, stop) with PyMuPDF, re-extracting poor pages with pdfplumber"""
+    import fitz
+
+    pages = []
+    plumber = None
+    try:
+        with fitz.open(stream=data, filetype="pdf") as doc:
+            for number in range(start, stop):
+                began = time.perf_counter()
+                page = _pymupdf_page(doc[number])
+                if _needs_fallback(page):
+                    if plumber is None:
+                        # Most PDFs never need the fallback, so pdfplumber is only imported for the ones that do
+                        import pdfplumber
+                        plumber = pdfplumber.open(io.BytesIO(data))
+                    fallback = _pdfplumber_page(plumber, number)
+                    if fallback.words:
+                        page = fallback
+                page.seconds = time.perf_counter() - began
+                pages.append(page)
+    finally:
+        if plumber is not None:
+            plumber.close()
+    return pages
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Streamlit and the review server run threads; forking them can copy a held lock into the child
+            _pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _parse_pdf(data: bytes, digest: str, workers: int) -> ParsedResume:
+    import fitz
+
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        page_count = doc.page_count
+    limit = min(page_count, MAX_PAGES)
+
+    if workers <= 1 or limit <= PARALLEL_PAGE_THRESHOLD:
+        pages = _parse_page_range(data, 0, limit)
+    else:
+        step = -(-limit // workers)  # ceiling division
+        futures = [_get_pool().submit(_parse_page_range, data, start, min(start + step, limit))
+                   for start in range(0, limit, step)]
+        pages = [page for future in futures for page in future.result()]
+
+    return ParsedResume(digest=digest, data=data, pages=pages, page_count=page_count)
+
+
+_parsed = LRUDiskCache("parsed", max_entries=MAX_PARSED_DOCUMENTS, persist=False)
+
+
+def parse_resume(source: ResumeSource, workers: Optional[int] = None) -> ParsedResume:
+    """Parse a resume PDF once per unique file content and reuse the result afterwards.
+
+    Long documents are split by page range across `workers` processes
+    (default PARSE_WORKERS); pass workers=1 when already inside a worker process.
+    """
+    data = _read_bytes(source)
+    digest = hashlib.sha256(data).hexdigest()
+
+    cached = _parsed.get(digest)
+    if cached is not None:
+        return cached
+
+    with span("parse_pdf"):
+        parsed = _parse_pdf(data, digest, PARSE_WORKERS if workers is None else workers)
+
+    _parsed.put(digest, parsed)
+    return parsed
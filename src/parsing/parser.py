@@ -1,10 +1,6 @@
-import pdfplumber
+from src.helpers.tracing import traced
+from src.parsing.document import parse_resume
 
-def extract_text_from_resume(resume) -> str: 
-    extracted_text = []
-    with pdfplumber.open(resume) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                extracted_text.append(page_text)
-    return "\n\n".join(extracted_text).strip()
\ No newline at end of file
+@traced("extract_text")
+def extract_text_from_resume(resume, workers: int | None = None) -> str: 
+    return parse_resume(resume, workers=workers).text
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""In-process requests against review_server, with benchmarks.fake_ollama standing in for Ollama."""
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.fake_ollama import start_fake_ollama
+
+# The LLM client and caches read the environment when first used, so point them at the fake server up front
+_fake = start_fake_ollama(latency=0.5)
+os.environ["OLLAMA_HOST"] = os.environ["OLLAMA_HOSTS"] = f"http://127.0.0.1:{_fake.server_address[1]}"
+os.environ["RESUME_REVIEWER_CACHE_DIR"] = tempfile.mkdtemp(prefix="resume-review-test-")
+os.environ["RESUME_REVIEWER_SEMANTIC"] = "0"
+
+import review_server  # noqa: E402
+from src.llm.client import get_client  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    ready = threading.Event()
+    address = {}
+
+    def on_ready(server):
+        address["port"] = server.sockets[0].getsockname()[1]
+        ready.set()
+
+    threading.Thread(target=lambda: asyncio.run(review_server.serve("127.0.0.1", 0, ready=on_ready)),
+                     daemon=True).start()
+    assert ready.wait(10)
+    return f"http://127.0.0.1:{address['port']}"
+
+
+def post(url: str, body: bytes, content_type: str = "application/json") -> tuple[int, dict, dict]:
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": content_type})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, dict(response.headers), json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), json.loads(e.read())
+
+
+def test_identical_concurrent_requests_share_one_generation(base_url):
+    body = json.dumps({"resume_text": "Python developer with SQL and Airflow pipelines.",
+                       "job_role": "Data Engineer"}).encode()
+    calls_before = len(get_client().usage)
+
+    with ThreadPoolExecutor(10) as pool:
+        results = list(pool.map(lambda _: post(f"{base_url}/v1/feedback", body), range(10)))
+
+    assert {status for status, _, _ in results} == {200}
+    assert sorted(headers["X-Coalesced"] for _, headers, _ in results) == ["false"] + ["true"] * 9
+    assert len(get_client().usage) - calls_before == 1
+    assert all("score" in payload for _, _, payload in results)
+
+    with urllib.request.urlopen(f"{base_url}/metrics", timeout=10) as response:
+        metrics = response.read().decode()
+    assert 'resume_reviewer_llm_prompt_tokens_total{model="mistral",task="feedback"}' in metrics
+    with urllib.request.urlopen(f"{base_url}/healthz", timeout=10) as response:
+        health = json.loads(response.read())
+    assert health["llm_usage"]["feedback"]["calls"] >= 1
+    assert health["structured_output"]["feedback"]["calls"] >= 1
+    assert 'resume_reviewer_structured_output_total{event="calls",task="feedback"}' in metrics
+
+
+@pytest.mark.parametrize("path, body, content_type, status", [
+    ("/v1/feedback", b'{"resume_text": "Python developer"}', "application/json", 400),
+    ("/v1/feedback", b"{not json", "application/json", 400),
+    ("/v1/feedback?job_role=Engineer", b"this is not a pdf", "application/pdf", 400),
+    ("/v1/feedback", b'{"resume_text": "Python developer", "job_role": 42}', "application/json", 400),
+    ("/v1/feedback", b'{"resume_text": ["Python"], "job_role": "Engineer"}', "application/json", 400),
+    ("/v1/improved-resume", b'{"resume_text": "Python developer", "job_role": "Engineer", "improvements": "x"}',
+     "application/json", 400),
+    ("/v1/unknown", b'{"resume_text": "x", "job_role": "y"}', "application/json", 404),
+])
+def test_bad_requests_get_client_error_statuses(base_url, path, body, content_type, status):
+    code, _, payload = post(base_url + path, body, content_type)
+    assert code == status
+    assert payload["error"]
+
+
+def test_malformed_content_length_is_rejected(base_url):
+    port = int(base_url.rsplit(":", 1)[1])
+    with socket.create_connection(("127.0.0.1", port), timeout=10) as sock:
+        sock.sendall(b"POST /v1/feedback HTTP/1.1\r\nHost: x\r\nContent-Length: abc\r\n\r\n")
+        status_line = sock.makefile("rb").readline()
+    assert status_line.split()[1] == b"400"
+
+
+def test_waiters_still_get_the_result_when_the_first_caller_is_cancelled():
+    async def scenario():
+        flight = review_server.SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        leader = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        release.set()
+        return await asyncio.wait_for(follower, 5)
+
+    assert asyncio.run(scenario()) == ("done", True)